@@ -0,0 +1,59 @@
+<?php
+
+namespace Database\Seeders;
+
+use Illuminate\Database\Seeder;
+use Illuminate\Support\Facades\DB;
+
+class BulkDonationSeeder extends Seeder
+{
+    /**
+     * Rows per insert statement (kept small enough for SQLite's bound parameter limit).
+     */
+    protected const CHUNK = 100;
+
+    /**
+     * Replace all donations with a generated dataset for scalability tests.
+     *
+     * The number of rows is read from the DONATION_SEED_COUNT environment variable.
+     */
+    public function run(): void
+    {
+        $count = (int) env('DONATION_SEED_COUNT', 1000);
+        $currencies = ['USD', 'EUR', 'GBP', 'INR'];
+        $amounts = [10, 25, 50, 100, 250, 500];
+        $start = now()->subSeconds($count);
+
+        DB::table('donations')->truncate();
+
+        DB::transaction(function () use ($count, $currencies, $amounts, $start) {
+            $rows = [];
+
+            for ($i = 1; $i <= $count; $i++) {
+                // One second apart, so latest() has a well-defined order
+                $createdAt = $start->copy()->addSeconds($i);
+
+                $rows[] = [
+                    'donor_name' => "Seeded Donor {$i}",
+                    'donor_email' => "donor{$i}@seed.test",
+                    'amount' => $amounts[$i % count($amounts)],
+                    'currency' => $currencies[$i % count($currencies)],
+                    'message' => $i % 3 === 0 ? null : "Seeded donation {$i}",
+                    'created_at' => $createdAt,
+                    'updated_at' => $createdAt,
+                ];
+
+                if (count($rows) === self::CHUNK) {
+                    DB::table('donations')->insert($rows);
+                    $rows = [];
+                }
+            }
+
+            if ($rows) {
+                DB::table('donations')->insert($rows);
+            }
+        });
+
+        $this->command?->info("Seeded {$count} donations.");
+    }
+}
@@ -0,0 +1,103 @@
+"""Local fake of the currency API that CurrencyService calls.
+
+Answers `GET /v3/latest` in the currencyapi.com format CurrencyService reads
+(`data.<CODE>.value`), with configurable faults:
+
+* `latency` (+ random `jitter`) seconds before every answer
+* `error_rate`: share of requests answered with a 500
+* `timeout_rate`: share of requests that hang for `hang` seconds, longer than
+  the 30s default timeout of Laravel's HTTP client
+
+Its rates differ from CurrencyService's fallback rates, so a client can tell
+which one it got. Point the application at it with
+
+    CURRENCY_API_URL=http://127.0.0.1:8099/v3/latest
+
+and run it on its own, e.g. to try the donate page against a slow upstream:
+
+    python -m benchmarks.currency_api --port 8099 --latency 2 --error-rate 0.2
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+RATES = {"USD": 1.0, "EUR": 0.9214, "GBP": 0.7866, "INR": 83.4051}
+FALLBACK_RATES = {"USD": 1.0, "EUR": 0.92, "GBP": 0.79, "INR": 83.12}  # CurrencyService::getFallbackRates
+
+
+class FakeCurrencyApi:
+    """Currency API with injectable latency, errors and timeouts"""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, timeout_rate=0.0, hang=35.0, seed=0):
+        self.rng = random.Random(seed)
+        self.runner = None
+        self.configure(latency=latency, jitter=jitter, error_rate=error_rate, timeout_rate=timeout_rate, hang=hang)
+
+    def configure(self, **settings):
+        """Change the faults and reset the counters"""
+        for name, value in settings.items():
+            setattr(self, name, value)
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+
+    async def latest(self, request):
+        self.requests += 1
+        roll = self.rng.random()
+        if roll < self.timeout_rate:
+            self.timeouts += 1
+            await asyncio.sleep(self.hang)
+        await asyncio.sleep(self.latency + self.rng.uniform(0, self.jitter))
+        if roll < self.timeout_rate + self.error_rate:
+            self.errors += 1
+            return web.json_response({"message": "Injected upstream failure"}, status=500)
+
+        codes = request.query.get("currencies", ",".join(RATES)).split(",")
+        return web.json_response({
+            "meta": {"last_updated_at": datetime.now(timezone.utc).isoformat()},
+            "data": {code: {"code": code, "value": RATES[code]} for code in codes if code in RATES},
+        })
+
+    async def start(self, host="127.0.0.1", port=8099):
+        app = web.Application()
+        app.router.add_get("/v3/latest", self.latest)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, host, port).start()
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="0.0.0.0 to reach it from a container")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--hang", type=float, default=35.0, help="seconds a timed-out request hangs")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        fake = FakeCurrencyApi(args.latency, args.jitter, args.error_rate, args.timeout_rate, args.hang)
+        await fake.start(args.host, args.port)
+        print(f"fake currency API on http://{args.host}:{args.port}/v3/latest")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await fake.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
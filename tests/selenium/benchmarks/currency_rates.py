@@ -0,0 +1,170 @@
+"""CurrencyService caching under a slow, failing or hanging upstream.
+
+Runs the fake currency API from benchmarks.currency_api in-process and, for
+each fault scenario, clears the application's rate cache and then measures
+`GET /api/currency/rates`:
+
+* cold: `concurrency` simultaneous requests right after clearing the cache
+  (Cache::remember has no lock, so each of them may call the upstream)
+* warm: `concurrency` virtual users for `duration` seconds
+
+and reports cold and warm latency, the cache hit ratio (application requests
+that did not reach the upstream) and the share of responses carrying the
+fallback rates. The application must be started with the fake as upstream:
+
+    CURRENCY_API_URL=http://127.0.0.1:8099/v3/latest php artisan serve
+    python -m benchmarks.currency_rates --duration 10
+    python -m benchmarks.currency_rates --scenario slow --scenario down --baseline results/currency-rates.json
+
+The fake listens on 127.0.0.1 only. The Docker setup needs `--fake-host 0.0.0.0`
+(reachable from the whole network, so only on a trusted one),
+`CURRENCY_API_URL=http://host.docker.internal:8099/v3/latest` and
+`--clear-cache-command "docker exec laravel_app php artisan cache:forget currency_exchange_rates"`.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import subprocess
+import time
+
+import aiohttp
+
+from benchmarks import load
+from benchmarks.currency_api import FALLBACK_RATES, FakeCurrencyApi
+
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+CLEAR_CACHE_COMMAND = "php artisan cache:forget currency_exchange_rates"
+ENDPOINT = "GET /api/currency/rates"
+
+SCENARIOS = {
+    "healthy": {},
+    "slow": {"latency": 0.5, "jitter": 0.2},
+    "flaky": {"error_rate": 0.3},
+    "down": {"error_rate": 1.0},
+    "timeout": {"timeout_rate": 1.0},
+}
+
+
+def clear_cache(command):
+    subprocess.run(shlex.split(command), cwd=APP_ROOT, check=True, capture_output=True)
+
+
+def is_fallback(rates):
+    """True when the response carries CurrencyService's hard-coded rates"""
+    return all(rates.get(code, {}).get("rate") == rate for code, rate in FALLBACK_RATES.items())
+
+
+async def scenario(http, base_url, fake, faults, concurrency, duration, clear_command):
+    fake.configure(**{"latency": 0.0, "jitter": 0.0, "error_rate": 0.0, "timeout_rate": 0.0, **faults})
+    fallbacks = 0
+
+    async def fetch(_user=None):
+        nonlocal fallbacks
+        async with http.get(f"{base_url}/api/currency/rates", headers={"Accept": "application/json"}) as response:
+            body = await response.read()
+            if response.status == 200 and is_fallback(json.loads(body)):
+                fallbacks += 1
+            return ENDPOINT, response.status, response.status == 200
+
+    clear_cache(clear_command)
+    cold = load.Recorder()
+
+    async def timed():
+        started = time.perf_counter()
+        try:
+            _, status, ok = await fetch()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            status, ok = type(error).__name__, False
+        cold.add(ENDPOINT, time.perf_counter() - started, status, ok)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(timed() for _ in range(concurrency)))
+    cold_stats = cold.summary(time.perf_counter() - started)[ENDPOINT]
+    cold_upstream = fake.requests
+
+    async def make_user():
+        return None
+
+    warm = await load.run(make_user, fetch, concurrency, duration)
+    warm_stats = warm.get(ENDPOINT, {"requests": 0})
+
+    total = cold_stats["requests"] + warm_stats["requests"]
+    return {
+        "faults": faults,
+        "cold": cold_stats,
+        "warm": warm_stats,
+        "upstream_requests": fake.requests,
+        "cold_upstream_requests": cold_upstream,
+        "upstream_errors": fake.errors,
+        "upstream_timeouts": fake.timeouts,
+        "cache_hit_ratio": 1 - fake.requests / total if total else 0.0,
+        "fallback_rate": fallbacks / total if total else 0.0,
+    }
+
+
+async def benchmark(base_url, scenarios, concurrency, duration, fake_host, fake_port, clear_command):
+    fake = FakeCurrencyApi()
+    await fake.start(fake_host, fake_port)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    http = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=60))
+    results = {}
+    try:
+        for name in scenarios:
+            results[name] = await scenario(http, base_url, fake, SCENARIOS[name], concurrency, duration, clear_command)
+            if name == "healthy" and results[name]["upstream_requests"] == 0:
+                print(f"warning: the application never called the fake currency API; start it with "
+                      f"CURRENCY_API_URL=http://<this host>:{fake_port}/v3/latest")
+    finally:
+        await http.close()
+        await fake.stop()
+    return results
+
+
+def print_results(results, baseline=None):
+    previous = {}
+    if baseline:
+        with open(baseline) as handle:
+            previous = json.load(handle)["results"]
+    print(f"{'scenario':<10}{'cold p50':>10}{'cold p99':>10}{'warm p50':>10}{'warm p95':>10}"
+          f"{'req/s':>9}{'hit ratio':>11}{'fallback':>10}{'upstream':>10}")
+    for name, stats in results.items():
+        cold, warm = stats["cold"], stats["warm"]
+        line = (
+            f"{name:<10}{cold['p50_ms']:>8.0f}ms{cold['p99_ms']:>8.0f}ms"
+            f"{warm.get('p50_ms', 0):>8.1f}ms{warm.get('p95_ms', 0):>8.1f}ms"
+            f"{warm.get('requests_per_second', 0):>9.1f}{stats['cache_hit_ratio']:>11.2%}"
+            f"{stats['fallback_rate']:>10.2%}{stats['upstream_requests']:>10}"
+        )
+        before = previous.get(name)
+        if before and before["warm"].get("p95_ms") is not None and "p95_ms" in warm:
+            line += f"  (cold p50 {cold['p50_ms'] - before['cold']['p50_ms']:+.0f}ms, warm p95 {warm['p95_ms'] - before['warm']['p95_ms']:+.1f}ms)"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="scenario to run, may be repeated (default: all)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=10, help="seconds of warm load per scenario")
+    parser.add_argument("--fake-host", default="127.0.0.1", help="0.0.0.0 to reach the fake from a container")
+    parser.add_argument("--fake-port", type=int, default=8099)
+    parser.add_argument("--clear-cache-command", default=os.environ.get("CLEAR_CACHE_COMMAND", CLEAR_CACHE_COMMAND))
+    parser.add_argument("--output", default="results/currency-rates.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenario or list(SCENARIOS)
+    results = asyncio.run(benchmark(
+        args.base_url, scenarios, args.concurrency, args.duration, args.fake_host, args.fake_port,
+        args.clear_cache_command,
+    ))
+    print_results(results, args.baseline)
+    load.write_results(args.output, "currency-rates", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
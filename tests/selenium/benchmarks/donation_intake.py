@@ -0,0 +1,170 @@
+"""Load test for the two donation intake endpoints.
+
+Sends realistic donations to `POST /api/donations` (JSON API) and to the web
+`POST /donate` route the donation form uses (an Inertia request carrying the
+session and XSRF cookies), and reports requests/sec, p50/p95/p99 latency and
+error rate per endpoint.
+
+Laravel answers a web donation with a redirect back to /donate whether it
+was saved or failed validation, so the redirect is followed like the browser
+does and a page with validation errors counts as an error. Loading /donate
+for the session cookies happens before the request is timed.
+
+    python -m benchmarks.donation_intake --concurrency 20 --duration 30
+    python -m benchmarks.donation_intake --target web --baseline results/donation-intake.json
+"""
+import argparse
+import asyncio
+import random
+from urllib.parse import unquote, urljoin
+
+import aiohttp
+
+from benchmarks import load
+from support import inertia
+
+CURRENCIES = ["USD", "EUR", "GBP", "INR"]
+PRESET_AMOUNTS = [10, 25, 50, 100, 250, 500]
+DONORS = ["John Doe", "E2E Test User", "Donor USD", "Donor EUR", "Donor GBP", "Donor INR"]
+MESSAGES = ["Test donation via Selenium", "End-to-end test donation", "Keep up the good work", ""]
+VALIDATION_FAILED = "validation failed"
+
+
+def donation(rng):
+    """A donation like the ones the Selenium tests submit"""
+    name = rng.choice(DONORS)
+    amount = rng.choice(PRESET_AMOUNTS) if rng.random() < 0.7 else round(rng.uniform(1, 1000), 2)
+    payload = {
+        "donor_name": name,
+        "donor_email": f"{name.lower().replace(' ', '.')}{rng.randint(1, 9999)}@test.com",
+        "amount": amount,
+        "currency": rng.choice(CURRENCIES),
+    }
+    message = rng.choice(MESSAGES)
+    if message:
+        payload["message"] = message
+    return payload
+
+
+class Donor:
+    """One virtual user with its own cookie jar"""
+
+    def __init__(self, base_url, connector, targets, seed):
+        self.base_url = base_url
+        self.targets = targets
+        self.rng = random.Random(seed)
+        self.http = aiohttp.ClientSession(
+            connector=connector,
+            connector_owner=False,
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+            timeout=aiohttp.ClientTimeout(total=30),
+        )
+        self.has_session = False
+        self.version = None
+
+    def xsrf_token(self):
+        cookie = self.http.cookie_jar.filter_cookies(self.base_url).get("XSRF-TOKEN")
+        return unquote(cookie.value) if cookie else ""
+
+    def inertia_headers(self):
+        headers = {
+            "X-Inertia": "true",
+            "X-Requested-With": "XMLHttpRequest",
+            "X-XSRF-TOKEN": self.xsrf_token(),
+            "Referer": f"{self.base_url}/donate",  # Where back() redirects to
+        }
+        if self.version:
+            headers["X-Inertia-Version"] = self.version
+        return headers
+
+    async def start_session(self):
+        """Load the donation page for the session and XSRF cookies and the asset version"""
+        async with self.http.get(f"{self.base_url}/donate") as response:
+            self.version = inertia.from_html(await response.text()).version
+        self.has_session = True
+
+    async def prepare(self):
+        """Start a session before the first web donation and after a 419, outside the timing"""
+        if "web" not in self.targets or self.has_session:
+            return
+        try:
+            await self.start_session()
+        except (aiohttp.ClientError, asyncio.TimeoutError, AssertionError):
+            pass  # The donation then fails with a 419 and is counted as an error
+
+    async def post_api(self):
+        async with self.http.post(
+            f"{self.base_url}/api/donations", json=donation(self.rng), headers={"Accept": "application/json"},
+        ) as response:
+            await response.read()
+            return "POST /api/donations", response.status, response.status == 201
+
+    async def post_web(self):
+        async with self.http.post(
+            f"{self.base_url}/donate", json=donation(self.rng), headers=self.inertia_headers(), allow_redirects=False,
+        ) as response:
+            await response.read()
+            status, location = response.status, response.headers.get("Location")
+        if status not in (302, 303) or not location:
+            if status == 419:
+                self.has_session = False  # Session expired, start a new one next time
+            return "POST /donate", status, False
+
+        # Saved or not, back() leads to /donate; only that page shows validation errors
+        async with self.http.get(urljoin(f"{self.base_url}/donate", location), headers=self.inertia_headers()) as page:
+            if page.status != 200:
+                if page.status == 409:
+                    self.has_session = False  # New assets; learn the version again
+                return "POST /donate", page.status, False
+            errors = inertia.InertiaPage(await page.json(content_type=None)).errors
+        if errors:
+            return "POST /donate", VALIDATION_FAILED, False
+        return "POST /donate", status, True
+
+    async def request(self):
+        if self.rng.choice(self.targets) == "api":
+            endpoint, send = "POST /api/donations", self.post_api
+        else:
+            endpoint, send = "POST /donate", self.post_web
+        try:
+            return await send()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            return endpoint, type(error).__name__, False
+
+
+async def benchmark(base_url, targets, concurrency, duration, seed=0):
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    users = iter(range(concurrency))
+
+    async def make_user():
+        return Donor(base_url, connector, targets, seed + next(users))
+
+    async def close_user(user):
+        await user.http.close()
+
+    try:
+        return await load.run(make_user, lambda user: user.request(), concurrency, duration, close_user,
+                              prepare=lambda user: user.prepare())
+    finally:
+        await connector.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--target", choices=["api", "web", "both"], default="both")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="results/donation-intake.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    targets = ["api", "web"] if args.target == "both" else [args.target]
+    results = asyncio.run(benchmark(args.base_url, targets, args.concurrency, args.duration, args.seed))
+    load.print_results(results, args.baseline)
+    load.write_results(args.output, "donation-intake", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Core of the asyncio load generator used by the benchmark scenarios.
+
+A scenario is an async callable `request(user)` that makes one request and
+returns `(endpoint, status, ok)`. `run` keeps `concurrency` virtual users
+calling it back to back until `duration` seconds have passed, then
+summarises throughput, latency percentiles and error rate per endpoint. An
+optional `prepare(user)` runs before each request, outside its timing, for
+setup a real user would not wait for on that request (e.g. a session).
+"""
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    rank = math.ceil(fraction * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+class Recorder:
+    """Latencies and outcomes of every request, grouped by endpoint"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.statuses = {}
+
+    def add(self, endpoint, seconds, status, ok):
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        self.errors.setdefault(endpoint, 0)
+        if not ok:
+            self.errors[endpoint] += 1
+        counts = self.statuses.setdefault(endpoint, {})
+        counts[str(status)] = counts.get(str(status), 0) + 1
+
+    def summary(self, elapsed):
+        results = {}
+        for endpoint, latencies in self.latencies.items():
+            ordered = sorted(latencies)
+            results[endpoint] = {
+                "requests": len(ordered),
+                "requests_per_second": len(ordered) / elapsed if elapsed else 0.0,
+                "p50_ms": percentile(ordered, 0.50) * 1000,
+                "p95_ms": percentile(ordered, 0.95) * 1000,
+                "p99_ms": percentile(ordered, 0.99) * 1000,
+                "error_rate": self.errors[endpoint] / len(ordered),
+                "statuses": self.statuses[endpoint],
+            }
+        return results
+
+
+async def run(make_user, request, concurrency, duration, close_user=None, prepare=None):
+    """Drive `concurrency` virtual users for `duration` seconds"""
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+
+    async def virtual_user():
+        user = await make_user()
+        try:
+            while time.perf_counter() < deadline:
+                if prepare is not None:
+                    await prepare(user)
+                started = time.perf_counter()
+                try:
+                    endpoint, status, ok = await request(user)
+                except Exception as error:
+                    endpoint, status, ok = getattr(error, "endpoint", "unknown"), type(error).__name__, False
+                recorder.add(endpoint, time.perf_counter() - started, status, ok)
+        finally:
+            if close_user is not None:
+                await close_user(user)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+    return recorder.summary(time.perf_counter() - started)
+
+
+def revision():
+    """Git revision of the working tree, if available"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def write_results(path, scenario, settings, results):
+    """Write a results file that can be compared between releases"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    document = {
+        "scenario": scenario,
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "revision": revision(),
+        "python": platform.python_version(),
+        "settings": settings,
+        "results": results,
+    }
+    with open(path, "w") as handle:
+        json.dump(document, handle, indent=2, sort_keys=True)
+    return document
+
+
+def print_results(results, baseline=None, key=None):
+    """Print one line per endpoint, with deltas against a baseline file
+
+    `key` names the part of the baseline's results holding the endpoints,
+    for scenarios that record more than endpoint statistics.
+    """
+    previous = {}
+    if baseline:
+        with open(baseline) as handle:
+            previous = json.load(handle)["results"]
+        if key:
+            previous = previous.get(key, {})
+    for endpoint, stats in sorted(results.items()):
+        line = (
+            f"{endpoint:<24} {stats['requests']:>7} req  {stats['requests_per_second']:8.1f} req/s  "
+            f"p50 {stats['p50_ms']:7.1f}ms  p95 {stats['p95_ms']:7.1f}ms  p99 {stats['p99_ms']:7.1f}ms  "
+            f"errors {stats['error_rate']:6.2%}"
+        )
+        before = previous.get(endpoint)
+        if before:
+            line += (
+                f"  (req/s {stats['requests_per_second'] - before['requests_per_second']:+.1f}, "
+                f"p95 {stats['p95_ms'] - before['p95_ms']:+.1f}ms)"
+            )
+        print(line)
@@ -0,0 +1,362 @@
+"""Soak test with donors and admins using the application at the same time.
+
+Runs a mix of virtual users for a fixed duration:
+
+* HTTP donors: post the donation form (`POST /donate`) with the session and
+  XSRF cookies of their own session, like benchmarks.donation_intake
+* HTTP admins: log in, read the dashboard (`GET /admin` and the
+  `GET /api/donations` it fetches) and log out and in again every
+  `--relogin-every` reads, so session regeneration runs under write load
+* browser donors and admins: the same through headless Chrome, launched
+  with the suite's options but without support.driver_pool's per-command
+  and per-page recording, which would grow for the whole run
+
+It reports throughput and latency percentiles per endpoint, the number of
+419 (page expired) answers, admin reads bounced to the login page ("session
+lost"), and how the resident memory of the browsers (every Chrome and
+chromedriver process, read from /proc) grew over the run.
+
+    python -m benchmarks.soak --duration 600 --donors 20 --admins 4 --browser-donors 2 --browser-admins 1
+    python -m benchmarks.soak --standin --duration 60     # fully local, against support.standin
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import tempfile
+import time
+from urllib.parse import unquote, urlparse
+
+import aiohttp
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from benchmarks import load
+from benchmarks.donation_intake import Donor, donation
+from support import chromedriver, forms, network, standin, waits
+from support.driver_pool import chrome_options
+from support.sessions import ADMIN_EMAIL, ADMIN_PASSWORD, AdminSession
+
+SESSION_LOST = "session lost"
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+class Admin:
+    """HTTP admin who reads the dashboard and logs in again every few reads"""
+
+    def __init__(self, base_url, connector, relogin_every):
+        self.base_url = base_url
+        self.relogin_every = relogin_every
+        self.http = aiohttp.ClientSession(
+            connector=connector,
+            connector_owner=False,
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+            timeout=aiohttp.ClientTimeout(total=30),
+        )
+        self.logged_in = False
+        self.reads = 0
+
+    def xsrf_token(self):
+        cookie = self.http.cookie_jar.filter_cookies(self.base_url).get("XSRF-TOKEN")
+        return unquote(cookie.value) if cookie else ""
+
+    async def login(self):
+        async with self.http.get(f"{self.base_url}/admin/login") as response:
+            await response.read()
+        async with self.http.post(
+            f"{self.base_url}/admin/login",
+            data={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD},
+            headers={"X-XSRF-TOKEN": self.xsrf_token(), "Accept": "text/html"},
+            allow_redirects=False,
+        ) as response:
+            await response.read()
+            location = response.headers.get("Location", "")
+            self.logged_in = response.status == 302 and not location.rstrip("/").endswith("/admin/login")
+            return "admin POST /admin/login", response.status, self.logged_in
+
+    async def logout(self):
+        async with self.http.post(
+            f"{self.base_url}/admin/logout",
+            headers={"X-XSRF-TOKEN": self.xsrf_token(), "Accept": "text/html"},
+            allow_redirects=False,
+        ) as response:
+            await response.read()
+            self.logged_in = False
+            self.reads = 0
+            return "admin POST /admin/logout", response.status, response.status == 302
+
+    async def read(self):
+        self.reads += 1
+        if self.reads % 2:
+            async with self.http.get(f"{self.base_url}/admin", allow_redirects=False) as response:
+                await response.read()
+                if response.status == 302:
+                    self.logged_in = False
+                    return "admin GET /admin", SESSION_LOST, False
+                return "admin GET /admin", response.status, response.status == 200
+        async with self.http.get(f"{self.base_url}/api/donations", headers={"Accept": "application/json"}) as response:
+            await response.read()
+            return "admin GET /api/donations", response.status, response.status == 200
+
+    async def request(self):
+        if not self.logged_in:
+            step = self.login
+        elif self.reads >= self.relogin_every:
+            step = self.logout
+        else:
+            step = self.read
+        try:
+            return await step()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            return "admin", type(error).__name__, False
+
+
+def post_status(driver, path):
+    """Status of the last POST to `path` in the browser's performance log"""
+    posts, status = set(), None
+    for _, method, params in network.messages(driver):
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            if request_id in posts and "redirectResponse" in params:
+                status = params["redirectResponse"]["status"]
+                posts.discard(request_id)
+            elif params["request"]["method"] == "POST" and urlparse(params["request"]["url"]).path == path:
+                posts.add(request_id)
+        elif method == "Network.responseReceived" and request_id in posts:
+            status = params["response"]["status"]
+            posts.discard(request_id)
+    return status
+
+
+def launch_browser(profile_dir):
+    """Headless Chrome with the suite's options and nothing recorded per command"""
+    driver = webdriver.Chrome(service=Service(chromedriver.resolve()), options=chrome_options(profile_dir))
+    driver.implicitly_wait(0)
+    waits.install(driver)  # AdminSession.login_via_ui waits for the Inertia visit
+    network.block(driver)  # Also enables the Network events post_status reads
+    return driver
+
+
+class BrowserDonor:
+    """Submits the donation form over and over in one browser"""
+
+    def __init__(self, driver, base_url, seed):
+        self.base_url = base_url
+        self.rng = random.Random(seed)
+        self.driver = driver
+        self.loaded = False
+
+    def request(self):
+        if not self.loaded:
+            self.driver.get(f"{self.base_url}/donate")
+            self.loaded = True
+        result = forms.submit_many(self.driver, [donation(self.rng)])[0]
+        status = post_status(self.driver, "/donate")
+        if status == 419:
+            self.loaded = False  # Reload the page for a fresh token
+        return "browser POST /donate", status, status in (302, 303) and not result["errors"]
+
+
+class BrowserAdmin:
+    """Reloads the admin dashboard in one browser"""
+
+    def __init__(self, driver, base_url):
+        self.base_url = base_url
+        self.driver = driver
+        self.session = AdminSession(base_url)
+        self.session.authenticate(self.driver)
+        self.session.inject(self.driver)
+
+    def request(self):
+        self.driver.get(f"{self.base_url}/admin")
+        network.drain(self.driver)  # Nothing reads it; chromedriver would keep it all
+        if "/admin/login" in self.driver.current_url:
+            self.session.authenticate(self.driver)
+            self.session.inject(self.driver)
+            return "browser GET /admin", SESSION_LOST, False
+        return "browser GET /admin", 200, True
+
+
+def tree_rss(root):
+    """Resident bytes of a process and all of its descendants, from /proc"""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as handle:
+                parent = int(handle.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+    total, pending = 0, [root]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/statm") as handle:
+                total += int(handle.read().split()[1]) * PAGE_SIZE
+        except OSError:
+            pass
+    return total
+
+
+def browsers_rss(drivers):
+    """Resident bytes of every browser, None where /proc is missing"""
+    if not os.path.isdir("/proc"):
+        return None
+    return sum(tree_rss(driver.service.process.pid) for driver in list(drivers))
+
+
+def memory_summary(samples):
+    """Start, end, peak and growth of the sampled browser memory, in MB"""
+    if len(samples) < 2:
+        return {"samples": samples}
+    seconds = [t for t, _ in samples]
+    megabytes = [mb for _, mb in samples]
+    mean_t, mean_mb = sum(seconds) / len(seconds), sum(megabytes) / len(megabytes)
+    spread = sum((t - mean_t) ** 2 for t in seconds)
+    slope = sum((t - mean_t) * (mb - mean_mb) for t, mb in samples) / spread if spread else 0.0
+    return {
+        "start_mb": megabytes[0],
+        "end_mb": megabytes[-1],
+        "peak_mb": max(megabytes),
+        "growth_mb": megabytes[-1] - megabytes[0],
+        "growth_mb_per_minute": slope * 60,  # Least-squares trend, not just end minus start
+        "samples": samples,
+    }
+
+
+def count(endpoints, status):
+    return sum(stats["statuses"].get(str(status), 0) for stats in endpoints.values())
+
+
+async def soak(base_url, donors, admins, browser_donors, browser_admins, duration, relogin_every,
+               sample_every, seed):
+    connector = aiohttp.TCPConnector(limit=donors + admins + 1)
+    browsers = browser_donors + browser_admins
+    profiles = tempfile.mkdtemp(prefix="soak-profiles-")
+    drivers, idle = [], []
+    seeds = iter(range(seed, seed + donors + browser_donors))
+    samples = []
+
+    async def close_http(user):
+        await user.http.close()
+
+    async def make_donor():
+        return Donor(base_url, connector, ["web"], next(seeds))
+
+    async def donor_request(user):
+        endpoint, status, ok = await user.request()
+        return f"donor {endpoint}", status, ok
+
+    async def make_admin():
+        return Admin(base_url, connector, relogin_every)
+
+    async def make_browser_donor():
+        return await asyncio.to_thread(BrowserDonor, idle.pop(), base_url, next(seeds))
+
+    async def make_browser_admin():
+        return await asyncio.to_thread(BrowserAdmin, idle.pop(), base_url)
+
+    async def browser_request(user):
+        return await asyncio.to_thread(user.request)
+
+    def quit_all():
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    async def sample(started, stop):
+        while not stop.is_set():
+            rss = await asyncio.to_thread(browsers_rss, drivers)
+            if rss is not None:
+                samples.append((round(time.perf_counter() - started, 1), round(rss / 2 ** 20, 1)))
+            try:
+                await asyncio.wait_for(stop.wait(), sample_every)
+            except asyncio.TimeoutError:
+                pass
+
+    try:
+        # Launch every browser first, so the memory baseline covers all of them
+        def launch_all():
+            for index in range(browsers):
+                drivers.append(launch_browser(os.path.join(profiles, f"profile-{index}")))
+            idle.extend(drivers)
+
+        await asyncio.to_thread(launch_all)
+        roles = [
+            (donors, make_donor, donor_request, close_http, lambda user: user.prepare()),
+            (admins, make_admin, lambda user: user.request(), close_http, None),
+            (browser_donors, make_browser_donor, browser_request, None, None),
+            (browser_admins, make_browser_admin, browser_request, None, None),
+        ]
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample(time.perf_counter(), stop)) if browsers else None
+        summaries = await asyncio.gather(*(
+            load.run(make_user, request, users, duration, close_user, prepare)
+            for users, make_user, request, close_user, prepare in roles if users
+        ))
+        stop.set()
+        if sampler is not None:
+            await sampler
+    finally:
+        await connector.close()
+        await asyncio.to_thread(quit_all)
+        shutil.rmtree(profiles, ignore_errors=True)
+
+    endpoints = {endpoint: stats for summary in summaries for endpoint, stats in summary.items()}
+    return {
+        "endpoints": endpoints,
+        "page_expired": count(endpoints, 419),
+        "session_lost": count(endpoints, SESSION_LOST),
+        "browser_memory": memory_summary(samples),
+    }
+
+
+def print_results(results, baseline=None):
+    load.print_results(results["endpoints"], baseline, key="endpoints")
+    print(f"419 page expired: {results['page_expired']}   session lost: {results['session_lost']}")
+    memory = results["browser_memory"]
+    if "growth_mb" in memory:
+        print(
+            f"browser memory: {memory['start_mb']:.0f} MB -> {memory['end_mb']:.0f} MB "
+            f"(peak {memory['peak_mb']:.0f} MB, trend {memory['growth_mb_per_minute']:+.1f} MB/min)"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--standin", action="store_true", help="serve support.standin in-process and soak that")
+    parser.add_argument("--donors", type=int, default=8, help="HTTP donors")
+    parser.add_argument("--admins", type=int, default=2, help="HTTP admins")
+    parser.add_argument("--browser-donors", type=int, default=2)
+    parser.add_argument("--browser-admins", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=120, help="seconds")
+    parser.add_argument("--relogin-every", type=int, default=20, help="dashboard reads between admin logins")
+    parser.add_argument("--sample-every", type=float, default=5, help="seconds between browser memory samples")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="results/soak.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    started = standin.start() if args.standin else None
+    base_url = started[1] if started else args.base_url
+    try:
+        results = asyncio.run(soak(
+            base_url, args.donors, args.admins, args.browser_donors, args.browser_admins, args.duration,
+            args.relogin_every, args.sample_every, args.seed,
+        ))
+    finally:
+        if started:
+            standin.stop(started)
+    print_results(results, args.baseline)
+    load.write_results(args.output, "soak", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,106 @@
+import shutil
+import tempfile
+
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+
+pytest.register_assert_rewrite("support")
+
+from support import watch
+from support.api_client import ApiClient
+from support.driver_pool import DriverPool
+from support.lookups import Lookup
+from support.sessions import AdminSession
+from support.waits import Waiter
+
+pytest_plugins = [
+    "support.reporting",
+    "support.parallel",
+    "support.waits",
+    "support.lookups",
+    "support.sessions",
+    "support.chromedriver",
+    "support.scalability",
+    "support.perf",
+    "support.history",
+    "support.network",
+    "support.visual",
+    "support.blackbox",
+    "support.standin",
+    "support.http_archive",
+    "support.database",
+    "support.visits",
+]
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "api: browser-free HTTP tests (run only these with -m api)")
+    config.addinivalue_line("markers", "scalability: large-dataset tests, enabled with --dataset-sizes")
+    config.addinivalue_line("markers", "visual: screenshot comparisons against the baselines in visual/")
+
 
 @pytest.fixture(scope="session")
-def driver():
-    """Setup Chrome WebDriver"""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Run in headless mode
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    driver.implicitly_wait(10)
-    
+def driver_pool(request, tmp_path_factory, app_url):
+    """Chrome sessions owned by this worker, kept between runs by support.watch"""
+    network_policy = not request.config.getoption("no_network_policy")
+    if watch.active:
+        # pytest prunes old tmp_path directories, so the kept profiles live elsewhere
+        def close(pool):
+            pool.close()
+            shutil.rmtree(pool.profile_root, ignore_errors=True)
+
+        yield watch.keep(
+            ("driver pool", app_url, network_policy),
+            lambda: DriverPool(tempfile.mkdtemp(prefix="chrome-profiles-"), app_url, network_policy=network_policy),
+            close,
+        )
+        return
+
+    pool = DriverPool(str(tmp_path_factory.mktemp("chrome-profiles")), app_url, network_policy=network_policy)
+
+    yield pool
+
+    pool.close()
+
+
+@pytest.fixture
+def driver(driver_pool):
+    """Setup Chrome WebDriver with a clean browser state"""
+    driver = driver_pool.acquire()
+
     yield driver
-    
-    driver.quit()
+
+    driver_pool.release(driver)
+
+
+@pytest.fixture(scope="session")
+def admin_session(app_url):
+    """Admin login shared by every test in this worker"""
+    return AdminSession(app_url)
+
+
+@pytest.fixture(scope="session")
+def api(app_url):
+    """Pooled keep-alive HTTP client for the JSON API"""
+    client = ApiClient(app_url)
+
+    yield client
+
+    client.close()
+
+
+@pytest.fixture
+def wait(driver):
+    """Readiness waits for the current browser"""
+    return Waiter(driver)
+
+
+@pytest.fixture
+def lookup(driver):
+    """Explicit "expect present" and "probe" element lookups"""
+    return Lookup(driver)
+
 
 @pytest.fixture
-def base_url():
+def base_url(app_url):
     """Base URL for the application"""
-    return "http://localhost:8000"
+    return app_url
@@ -0,0 +1 @@
+"""Shared helpers and pytest plugins for the Selenium suite"""
@@ -0,0 +1,47 @@
+"""Keep-alive HTTP client for calling the application without a browser"""
+import requests
+from requests.adapters import HTTPAdapter
+
+from support import visits
+
+
+class ApiClient:
+    """Thin wrapper around a pooled requests session bound to the base URL"""
+
+    def __init__(self, base_url, pool_size=10, timeout=10):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        self.http.headers.update({"Accept": "application/json"})
+        self.inertia_version = None  # Learned on the first Inertia request
+
+    def get(self, path, **kwargs):
+        visits.visit(path)
+        return self.http.get(f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+
+    def post(self, path, **kwargs):
+        visits.visit(path)
+        return self.http.post(f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+
+    def donations(self):
+        """Every stored donation, newest first"""
+        response = self.get("/api/donations")
+        response.raise_for_status()
+        return response.json()["data"]
+
+    def last_donation_id(self):
+        """Id of the newest stored donation, 0 when there is none"""
+        return max((donation["id"] for donation in self.donations()), default=0)
+
+    def saved_donations(self, after_id):
+        """(donor_email, amount) of every donation stored with an id above `after_id`"""
+        return {
+            (donation["donor_email"], float(donation["amount"]))
+            for donation in self.donations() if donation["id"] > after_id
+        }
+
+    def close(self):
+        self.http.close()
@@ -0,0 +1,110 @@
+"""Bounded record of what the browser did, kept for failing tests only.
+
+Every pooled browser carries a ring buffer of its most recent events:
+requests that failed or got a 4xx/5xx response, and Inertia visits with
+their response status. The events come from the DevTools network events that
+support.network already reads after each page load, so keeping them costs
+one deque append per interesting event. Console messages and uncaught errors
+stay in ChromeDriver's browser log.
+
+When a test fails, the rest of both logs is read and merged into the buffer.
+The events and a screenshot are then attached to the report: in the
+pytest-html report when it is installed, and always as a "browser events"
+section under the failure. When a test passes, the buffer and the logs are
+thrown away when the browser is reset.
+"""
+from collections import deque
+from datetime import datetime
+
+import pytest
+
+from support import network
+
+try:
+    import pytest_html
+except ImportError:  # The report sections below still work without it
+    pytest_html = None
+
+CAPACITY = 200
+
+
+def header(headers, name):
+    """Case-insensitive header lookup"""
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+class Recorder:
+    """Ring buffer of the last `capacity` browser events"""
+
+    def __init__(self, capacity=CAPACITY):
+        self.events = deque(maxlen=capacity)
+        self.requests = {}
+
+    def add(self, timestamp, kind, text):
+        self.events.append((timestamp, kind, text))
+
+    def network(self, timestamp, method, params):
+        """Keep failed requests, error responses and Inertia visits"""
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            request = params["request"]
+            inertia = header(request.get("headers", {}), "x-inertia") is not None
+            self.requests[request_id] = (request["method"], request["url"], inertia)
+            if inertia:
+                self.add(timestamp, "inertia", f"{request['method']} {request['url']}")
+        elif method == "Network.responseReceived" and request_id in self.requests:
+            http_method, url, inertia = self.requests[request_id]
+            status = params["response"]["status"]
+            if inertia:
+                location = header(params["response"].get("headers", {}), "x-inertia-location")
+                self.add(timestamp, "inertia", f"{http_method} {url} -> {status}" + (f" ({location})" if location else ""))
+            elif status >= 400:
+                self.add(timestamp, "http", f"{http_method} {url} -> {status}")
+        elif method == "Network.loadingFailed":
+            http_method, url, _ = self.requests.pop(request_id, ("request", request_id, False))
+            if not params.get("blockedReason"):  # Blocked on purpose by support.network
+                self.add(timestamp, "network", f"{http_method} {url} failed: {params.get('errorText')}")
+        elif method == "Network.loadingFinished":
+            self.requests.pop(request_id, None)
+
+    def clear(self):
+        self.events.clear()
+        self.requests.clear()
+
+    def dump(self, driver):
+        """Read what is left of the browser logs and return every event as text"""
+        for timestamp, method, params in network.messages(driver):
+            self.network(timestamp, method, params)
+        for entry in driver.get_log("browser"):
+            self.add(entry["timestamp"], f"console {entry['level'].lower()}", entry["message"])
+        return "\n".join(
+            f"{datetime.fromtimestamp(timestamp / 1000).strftime('%H:%M:%S.%f')[:-3]}  {kind:<15}  {text}"
+            for timestamp, kind, text in sorted(self.events, key=lambda event: event[0])
+        )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    driver = (getattr(item, "funcargs", None) or {}).get("driver")
+    recorder = getattr(driver, "blackbox", None)
+    # By teardown the browser has already been reset and handed back
+    if not report.failed or report.when == "teardown" or recorder is None:
+        return
+    try:
+        events = recorder.dump(driver)
+        screenshot = driver.get_screenshot_as_base64()
+    except Exception as error:  # The browser may be the reason the test failed
+        report.sections.append(("browser events", f"could not read the browser: {error}"))
+        return
+
+    report.sections.append(("browser events", events or "(none)"))
+    if pytest_html is not None:
+        extras = getattr(report, "extras", [])
+        extras.append(pytest_html.extras.text(events or "(none)", name="browser events"))
+        extras.append(pytest_html.extras.png(screenshot, name="screenshot"))
+        report.extras = extras
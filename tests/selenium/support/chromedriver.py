@@ -0,0 +1,187 @@
+"""Resolves a chromedriver binary without touching the network when possible.
+
+Resolution order:
+
+1. CHROMEDRIVER: an explicit binary path, used as is.
+2. The local cache (CHROMEDRIVER_CACHE, default ~/.cache/selenium-suite/chromedriver).
+   Each cached driver is stored under the Chrome major version it serves and
+   is listed in manifest.json with its full version and SHA-256. A binary
+   whose checksum no longer matches is ignored.
+3. webdriver-manager, which downloads a driver. The result is copied into the
+   cache so the next run is offline. Set SELENIUM_OFFLINE=1 to forbid this
+   step, e.g. on network-isolated CI runners.
+
+Only a driver whose major version matches the installed Chrome is used; a
+download for another major version is an error. When Chrome's version cannot
+be found, the newest intact cached driver is used before downloading.
+"""
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import time
+
+from support import reporting
+
+CHROME_BINARIES = {
+    "Linux": ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"],
+    "Darwin": ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"],
+}
+
+_resolved = None
+
+
+def cache_dir():
+    """Directory holding the cached drivers and their manifest"""
+    default = os.path.join(os.path.expanduser("~"), ".cache", "selenium-suite", "chromedriver")
+    return os.environ.get("CHROMEDRIVER_CACHE", default)
+
+
+def sha256(path):
+    """Checksum of a file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def major(version):
+    """Major part of a dotted version string"""
+    return version.split(".", 1)[0]
+
+
+def chrome_version():
+    """Version of the installed Chrome, or None if it cannot be found"""
+    if platform.system() == "Windows":
+        import winreg
+        try:
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon") as key:
+                return winreg.QueryValueEx(key, "version")[0]
+        except OSError:
+            return None
+
+    candidates = CHROME_BINARIES.get(platform.system(), [])
+    if os.environ.get("CHROME_BIN"):
+        candidates = [os.environ["CHROME_BIN"]] + candidates
+    for binary in candidates:
+        try:
+            output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        match = re.search(r"\d+(\.\d+)+", output)
+        if match:
+            return match.group(0)
+    return None
+
+
+def load_manifest():
+    path = os.path.join(cache_dir(), "manifest.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def save_manifest(manifest):
+    os.makedirs(cache_dir(), exist_ok=True)
+    with open(os.path.join(cache_dir(), "manifest.json"), "w") as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+
+
+def intact(entry):
+    """True when a manifest entry's binary exists and still has its checksum"""
+    return os.path.exists(entry["path"]) and sha256(entry["path"]) == entry["sha256"]
+
+
+def cached(chrome_major):
+    """Path of a cached driver for the Chrome major version, if it is intact"""
+    entry = load_manifest().get(chrome_major)
+    return entry["path"] if entry and intact(entry) else None
+
+
+def newest():
+    """Path of the intact cached driver with the highest major version, if any"""
+    manifest = load_manifest()
+    for chrome_major in sorted(manifest, key=lambda key: int(key) if key.isdigit() else -1, reverse=True):
+        if intact(manifest[chrome_major]):
+            return manifest[chrome_major]["path"]
+    return None
+
+
+def store(path, chrome_major, version):
+    """Copy a driver into the cache and pin it in the manifest"""
+    target_dir = os.path.join(cache_dir(), chrome_major)
+    os.makedirs(target_dir, exist_ok=True)
+    target = os.path.join(target_dir, os.path.basename(path))
+    shutil.copy2(path, target)
+    manifest = load_manifest()
+    manifest[chrome_major] = {"version": version, "path": target, "sha256": sha256(target)}
+    save_manifest(manifest)
+    return target
+
+
+def driver_version(path):
+    """Version reported by a chromedriver binary"""
+    output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    match = re.search(r"\d+(\.\d+)+", output)
+    return match.group(0) if match else ""
+
+
+def download():
+    """Fetch a driver with webdriver-manager"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def resolve():
+    """Return the chromedriver path for this process, resolving it once"""
+    global _resolved
+    if _resolved:
+        return _resolved
+
+    started = time.perf_counter()
+    source = "env"
+    path = os.environ.get("CHROMEDRIVER")
+    if not path:
+        version = chrome_version()
+        chrome_major = major(version) if version else None
+        # Without a Chrome version the newest cached driver is the best guess
+        path = cached(chrome_major) if chrome_major else newest()
+        source = "cache" if chrome_major else "cache (Chrome version unknown)"
+        if not path:
+            if os.environ.get("SELENIUM_OFFLINE") == "1":
+                raise RuntimeError(
+                    f"No cached chromedriver for Chrome {version or '(not found)'} in {cache_dir()} "
+                    "and SELENIUM_OFFLINE=1 forbids downloading one"
+                )
+            path = download()
+            source = "download"
+            downloaded = driver_version(path)
+            if chrome_major and major(downloaded) != chrome_major:
+                raise RuntimeError(
+                    f"webdriver-manager returned chromedriver {downloaded or '(unknown version)'} at {path} "
+                    f"for Chrome {version}; set CHROMEDRIVER to a matching driver"
+                )
+            if downloaded:
+                path = store(path, chrome_major or major(downloaded), downloaded)
+
+    _resolved = path
+    reporting.record("startup", phase="resolve", seconds=time.perf_counter() - started, detail=source)
+    return path
+
+
+@reporting.summary("startup", "browser startup")
+def render(terminalreporter, entries):
+    for phase in ("resolve", "launch", "cache warm-up", "first navigation"):
+        seconds = [e["seconds"] for e in entries if e["phase"] == phase]
+        if not seconds:
+            continue
+        details = sorted({e["detail"] for e in entries if e["phase"] == phase and e["detail"]})
+        terminalreporter.write_line(
+            f"{phase:<17} x{len(seconds):<3} total {sum(seconds):6.2f}s  "
+            f"slowest {max(seconds):6.2f}s  {', '.join(details)}"
+        )
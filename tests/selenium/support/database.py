@@ -0,0 +1,247 @@
+"""One database per worker, restored from a snapshot before every test.
+
+`pytest --app isolated` runs each pytest worker against its own copy of the
+Laravel application: `php artisan serve` on a free port, pointed by
+DB_CONNECTION/DB_DATABASE at a SQLite file of its own. Every file is a copy
+of a template built once per run (and reused until a migration or seeder
+changes, or `--db-baseline-donations` differs from the count recorded next to
+it): migrated, with the admin user and `--db-baseline-donations` donations
+from BulkDonationSeeder.
+
+Before each test the worker's data tables are put back to the template's
+rows inside one transaction (the template is attached read-only, every table
+is emptied and refilled). For a seeded database this takes milliseconds, so
+tests such as the donation submissions can no longer change what the
+dashboard tests see, and the suite can run in parallel or in any order. The
+sessions and cache tables are left alone, so the cached admin login and the
+currency rates survive. Template, clone, server start and restore timings are
+listed under "database isolation" in the summary.
+
+Needs PHP and the application's dependencies installed locally; the Docker
+setup shares one database and cannot be isolated this way.
+"""
+import glob
+import os
+import shlex
+import shutil
+import signal
+import socket
+import sqlite3
+import statistics
+import subprocess
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from support import parallel, reporting, watch
+
+SUITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_ROOT = os.path.dirname(os.path.dirname(SUITE_ROOT))
+
+TEMPLATE_COMMANDS = [
+    "php artisan migrate:fresh --force",
+    "php artisan db:seed --class=AdminUserSeeder --force",
+    "php artisan db:seed --class=BulkDonationSeeder --force",
+]
+SERVE_COMMAND = "php artisan serve --host=127.0.0.1 --port={port}"
+KEEP_TABLES = {"sessions", "cache", "cache_locks"}  # Not test data; restoring them logs the admin out
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("database")
+    group.addoption("--db-dir", default="results/db", help="where the template and worker databases live")
+    group.addoption("--db-baseline-donations", type=int, default=25,
+                    help="donations seeded into the template (default 25)")
+    group.addoption("--db-rebuild-template", action="store_true", help="rebuild the template even if it is current")
+    group.addoption("--db-serve-command", default=os.environ.get("DB_SERVE_COMMAND", SERVE_COMMAND),
+                    help="command that serves the application on {port}")
+
+
+def directory(config):
+    return os.path.join(SUITE_ROOT, config.getoption("db_dir"))
+
+
+def environment(database):
+    """Environment that points artisan at a SQLite file"""
+    return dict(os.environ, DB_CONNECTION="sqlite", DB_DATABASE=database)
+
+
+def is_current(template, donations):
+    """True when the template has `donations` seeded and is newer than every migration and seeder"""
+    if not os.path.exists(template):
+        return False
+    try:
+        with open(template + ".donations") as handle:
+            if int(handle.read()) != donations:
+                return False
+    except (OSError, ValueError):  # Built before the count was recorded
+        return False
+    sources = glob.glob(os.path.join(APP_ROOT, "database", "migrations", "*.php")) \
+        + glob.glob(os.path.join(APP_ROOT, "database", "seeders", "*.php"))
+    return all(os.path.getmtime(source) < os.path.getmtime(template) for source in sources)
+
+
+def build_template(template, donations):
+    """Migrate and seed a fresh SQLite file"""
+    building = template + ".building"
+    open(building, "w").close()  # artisan asks before creating a missing SQLite file
+    env = dict(environment(building), DONATION_SEED_COUNT=str(donations))
+    for command in TEMPLATE_COMMANDS:
+        try:
+            subprocess.run(shlex.split(command), cwd=APP_ROOT, env=env, check=True, capture_output=True, text=True)
+        except OSError as error:
+            raise pytest.UsageError(f"--app isolated could not run {command!r}: {error}")
+        except subprocess.CalledProcessError as error:
+            raise pytest.UsageError(f"--app isolated: {command!r} failed:\n{error.stdout}{error.stderr}")
+    os.replace(building, template)
+    with open(template + ".donations", "w") as handle:
+        handle.write(str(donations))
+
+
+def pytest_configure(config):
+    # Once per run, before pytest-xdist starts any worker
+    if config.getoption("app") != "isolated" or reporting.is_worker(config):
+        return
+    os.makedirs(directory(config), exist_ok=True)
+    template = os.path.join(directory(config), "template.sqlite")
+    donations = config.getoption("db_baseline_donations")
+    if config.getoption("db_rebuild_template") or not is_current(template, donations):
+        started = time.perf_counter()
+        build_template(template, donations)
+        reporting.record("database", phase="template", seconds=time.perf_counter() - started)
+
+
+class Snapshot:
+    """Puts a database's data tables back to the rows of a template"""
+
+    def __init__(self, database, template, keep=KEEP_TABLES):
+        # A URI connection, so the template can be attached read-only
+        self.connection = sqlite3.connect(f"file:{database}", uri=True, timeout=30, isolation_level=None,
+                                          check_same_thread=False)
+        self.connection.execute("ATTACH DATABASE ? AS snapshot", (f"file:{template}?mode=ro",))
+        self.tables = [
+            name for (name,) in self.connection.execute(
+                "SELECT name FROM snapshot.sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+            ) if name not in keep
+        ]
+        self.sequences = bool(self.connection.execute(
+            "SELECT 1 FROM snapshot.sqlite_master WHERE name = 'sqlite_sequence'"
+        ).fetchone())
+
+    def restore(self):
+        """Restore every data table in one transaction and return the seconds it took"""
+        started = time.perf_counter()
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            for table in self.tables:
+                self.connection.execute(f'DELETE FROM main."{table}"')
+                self.connection.execute(f'INSERT INTO main."{table}" SELECT * FROM snapshot."{table}"')
+            if self.sequences:  # AUTOINCREMENT counters, so new rows get the same ids every time
+                self.connection.execute("DELETE FROM main.sqlite_sequence")
+                self.connection.execute("INSERT INTO main.sqlite_sequence SELECT * FROM snapshot.sqlite_sequence")
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+        return time.perf_counter() - started
+
+    def close(self):
+        self.connection.close()
+
+
+class IsolatedApp:
+    """The application served for one worker, on a database of its own"""
+
+    def __init__(self, config):
+        root = directory(config)
+        template = os.path.join(root, "template.sqlite")
+        self.database = os.path.join(root, f"{parallel.worker_id()}.sqlite")
+
+        started = time.perf_counter()
+        shutil.copyfile(template, self.database)
+        for suffix in ("-wal", "-shm", "-journal"):  # Left over from an earlier run
+            if os.path.exists(self.database + suffix):
+                os.remove(self.database + suffix)
+        reporting.record("database", phase="clone", seconds=time.perf_counter() - started)
+
+        self.environment = environment(self.database)
+        self.url, self.process = self.serve(config.getoption("db_serve_command"))
+        self.snapshot = Snapshot(self.database, template)
+
+    def serve(self, command):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        url = f"http://127.0.0.1:{port}"
+        started = time.perf_counter()
+        # Its own process group: artisan serve runs the PHP server as a child
+        process = subprocess.Popen(
+            shlex.split(command.format(port=port)), cwd=APP_ROOT, env=self.environment,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True,
+        )
+        deadline = started + 30
+        while True:
+            try:
+                with urllib.request.urlopen(f"{url}/up", timeout=1):
+                    break
+            except (urllib.error.URLError, OSError):
+                if process.poll() is not None or time.perf_counter() > deadline:
+                    self.stop(process)
+                    raise RuntimeError(f"The application did not start with: {command.format(port=port)}")
+                time.sleep(0.1)
+        reporting.record("database", phase="server start", seconds=time.perf_counter() - started)
+        return url, process
+
+    @staticmethod
+    def stop(process):
+        if process.poll() is not None:
+            return
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except (AttributeError, ProcessLookupError):
+            process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    def restore(self):
+        reporting.record("database", phase="restore", seconds=self.snapshot.restore())
+
+    def close(self):
+        self.snapshot.close()
+        self.stop(self.process)
+
+
+@pytest.fixture(scope="session")
+def isolated_app(request):
+    """This worker's own application and database (only with --app isolated)"""
+    if watch.active:
+        yield watch.keep("isolated app", lambda: IsolatedApp(request.config), IsolatedApp.close)
+        return
+    app = IsolatedApp(request.config)
+    yield app
+    app.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_database(request):
+    """Start every test from the template's data"""
+    # The scalability tests seed once per module and must keep their rows
+    if request.config.getoption("app") != "isolated" or request.node.get_closest_marker("scalability"):
+        return
+    request.getfixturevalue("isolated_app").restore()
+
+
+@reporting.summary("database", "database isolation")
+def render(terminalreporter, entries):
+    for phase in ("template", "clone", "server start", "restore"):
+        seconds = sorted(entry["seconds"] for entry in entries if entry["phase"] == phase)
+        if not seconds:
+            continue
+        terminalreporter.write_line(
+            f"{phase:<13} x{len(seconds):<4} total {sum(seconds):7.3f}s  "
+            f"median {statistics.median(seconds) * 1000:7.2f}ms  max {seconds[-1] * 1000:7.2f}ms"
+        )
@@ -0,0 +1,139 @@
+"""Pool of headless Chrome sessions owned by a single pytest worker.
+
+Every browser gets its own profile directory, so cookies, local storage and
+the HTTP cache never leak between workers. Browsers are handed back to the
+pool after each test and wiped before they are reused.
+"""
+import os
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+from support import blackbox, chromedriver, network, perf, reporting, visits, waits
+
+
+def chrome_options(profile_dir):
+    """Chrome options shared by every pooled browser"""
+    options = Options()
+    options.add_argument("--headless")  # Run in headless mode
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    # Read by support.network and, for failing tests, support.blackbox
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"})
+    return options
+
+
+class PooledChrome(webdriver.Chrome):
+    """Chrome session that reports its startup and per-command timings"""
+
+    navigated = False
+    measuring = False
+    network_policy = False
+    blackbox = None
+
+    def execute(self, driver_command, params=None):
+        if self.measuring:
+            return super().execute(driver_command, params)
+        started = time.perf_counter()
+        try:
+            return super().execute(driver_command, params)
+        finally:
+            perf.command(time.perf_counter() - started)
+
+    def get(self, url):
+        if url == "about:blank":
+            return super().get(url)
+        visits.visit(url)
+        started = time.perf_counter()
+        super().get(url)
+        if not self.navigated:
+            self.navigated = True
+            reporting.record("startup", phase="first navigation", seconds=time.perf_counter() - started, detail="")
+
+        # Reading the timings must not count as a command of the test
+        self.measuring = True
+        try:
+            perf.navigation(self, url)
+            network.navigation(self, url)
+        finally:
+            self.measuring = False
+
+
+class DriverPool:
+    """Hands out Chrome sessions and resets them between tests"""
+
+    def __init__(self, profile_root, origin, network_policy=True):
+        self.profile_root = profile_root
+        self.origin = origin
+        self.network_policy = network_policy
+        self.idle = []
+        self.drivers = []
+
+    def acquire(self):
+        """Return an idle browser, launching a new one if none is free"""
+        if self.idle:
+            return self.idle.pop()
+        return self.launch()
+
+    def release(self, driver):
+        """Wipe the browser state and return it to the pool"""
+        try:
+            visits.visit(driver.current_url)  # Where the test's own clicks led
+            self.reset(driver)
+        except Exception:
+            # A browser that cannot be reset is not safe to reuse
+            self.discard(driver)
+            return
+        self.idle.append(driver)
+
+    def launch(self):
+        """Start a new Chrome session with its own profile directory"""
+        profile_dir = os.path.join(self.profile_root, f"profile-{len(self.drivers)}")
+        service = Service(chromedriver.resolve())
+        options = chrome_options(profile_dir)
+        if self.network_policy:
+            options.add_argument(network.origin_only(self.origin))
+        started = time.perf_counter()
+        driver = PooledChrome(service=service, options=options)
+        reporting.record("startup", phase="launch", seconds=time.perf_counter() - started, detail="")
+        driver.implicitly_wait(0)  # Lookups wait explicitly, see support.lookups
+        waits.install(driver)
+        driver.blackbox = blackbox.Recorder()
+        self.drivers.append(driver)
+        if self.network_policy:
+            driver.network_policy = True
+            network.block(driver)
+            network.warm(driver, self.origin)
+        return driver
+
+    def reset(self, driver):
+        """Clear cookies, storage, window size and logs left behind by a test"""
+        driver.get("about:blank")
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+            "origin": self.origin,
+            "storageTypes": "local_storage,session_storage,indexeddb,service_workers",
+        })
+        driver.set_window_size(1920, 1080)
+        network.drain(driver)
+        driver.get_log("browser")
+        driver.blackbox.clear()
+
+    def discard(self, driver):
+        """Quit a browser and forget about it"""
+        self.drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """Quit every browser owned by the pool"""
+        for driver in list(self.drivers):
+            self.discard(driver)
+        self.idle = []
@@ -0,0 +1,96 @@
+"""Fills React-controlled forms in a single WebDriver call.
+
+Typing into each field costs a find_element and a send_keys round trip per
+field. Instead, a script sets every value through the native value setter
+(so React notices the change), fires the input and change events React
+listens to, and then reads the values back after React has re-rendered to
+check that its state really picked them up. `submit_many` goes one step
+further and submits a whole list of records inside the page.
+"""
+HELPERS = """
+function fieldsOf(form, values) {
+    return Object.keys(values).map((name) => {
+        const field = form.querySelector(`[name="${name}"]`);
+        if (!field) throw new Error(`No field named ${name}`);
+        return [field, String(values[name])];
+    });
+}
+
+function fillForm(form, values) {
+    for (const [field, value] of fieldsOf(form, values)) {
+        const proto = field instanceof HTMLSelectElement ? HTMLSelectElement.prototype
+            : field instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+            : HTMLInputElement.prototype;
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(field, value);
+        field.dispatchEvent(new Event('input', { bubbles: true }));
+        field.dispatchEvent(new Event('change', { bubbles: true }));
+    }
+}
+
+function mismatches(form, values) {
+    return fieldsOf(form, values).filter(([field, value]) => field.value !== value).map(([field]) => field.name);
+}
+
+const tick = () => new Promise((resolve) => setTimeout(resolve, 0));
+"""
+
+FILL = HELPERS + """
+const [selector, values, done] = arguments;
+(async () => {
+    const form = document.querySelector(selector);
+    fillForm(form, values);
+    await tick();  // Let React re-render; a rejected value is reset to the old state
+    return mismatches(form, values);
+})().then(done, (error) => done({ error: String(error) }));
+"""
+
+SUBMIT_MANY = HELPERS + """
+const [selector, records, done] = arguments;
+(async () => {
+    const results = [];
+    for (const values of records) {
+        const form = document.querySelector(selector);
+        fillForm(form, values);
+        await tick();
+        const missed = mismatches(form, values);
+        if (!form.checkValidity()) {
+            results.push({ missed, invalid: true, errors: {} });
+            continue;
+        }
+        const finished = new Promise((resolve) => document.addEventListener('inertia:finish', resolve, { once: true }));
+        form.requestSubmit();
+        await finished;
+        await tick();
+        const page = window.history.state && window.history.state.page;
+        results.push({ missed, invalid: false, errors: (page && page.props.errors) || {} });
+    }
+    return results;
+})().then(done, (error) => done({ error: String(error) }));
+"""
+
+
+def run(driver, script, *args):
+    result = driver.execute_async_script(script, *args)
+    if isinstance(result, dict) and "error" in result:
+        raise AssertionError(f"Form script failed: {result['error']}")
+    return result
+
+
+def fill(driver, values, form="form"):
+    """Set every field of the form in one call and check React accepted them"""
+    missed = run(driver, FILL, form, values)
+    if missed:
+        raise AssertionError(f"React state did not pick up: {', '.join(missed)}")
+
+
+def submit_many(driver, records, form="form", seconds_per_record=10):
+    """Fill and submit the form once per record, all inside the page.
+
+    Returns one result per record with the fields React did not pick up
+    (`missed`), whether the browser's own validation blocked it (`invalid`),
+    and the validation errors the server sent back (`errors`). Empty errors
+    do not mean the record was stored: a 419 or any other redirect back to
+    the form has none either, so callers check the stored data as well.
+    """
+    driver.set_script_timeout(max(30, seconds_per_record * len(records)))
+    return run(driver, SUBMIT_MANY, form, records)
@@ -0,0 +1,224 @@
+"""Test history: longest-first scheduling and retries for known flaky tests.
+
+Every run stores each test's outcome, duration and number of attempts in a
+SQLite database (`--history-db`, results/history.sqlite by default). The next
+run uses the recent history (`--history-window` runs) to
+
+* order the tests longest-first, so that `pytest -n auto` hands the slow
+  end-to-end tests out first and the workers finish at about the same time
+  (tests without history are treated as average; scalability tests keep their
+  order at the end because they share a module-scoped seeded dataset);
+* retry, up to `--flaky-retries` times, only tests that are known to be flaky,
+  i.e. that both passed and failed (or needed a retry) in recent runs. Tests
+  that always fail are not retried;
+* flag tests whose flake rate or median duration went up in the newer half of
+  the window.
+
+    pytest -n auto                        # scheduled and retried from history
+    pytest --flaky-retries 0              # never retry
+    pytest --no-history                   # neither read nor record history
+"""
+import os
+import sqlite3
+import statistics
+import time
+
+import pytest
+from _pytest.runner import runtestprotocol
+
+from support import reporting
+
+SUITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DURATION_TREND = 0.25
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    test TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    attempts INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_test ON results (test, run_id);
+"""
+
+_history = {}
+_outcomes = {}
+
+
+class History:
+    """Recent results of one test, oldest first"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @property
+    def median_duration(self):
+        return statistics.median(row["duration"] for row in self.rows)
+
+    @staticmethod
+    def flake_rate_of(rows):
+        """Share of runs that failed or only passed after a retry"""
+        if not rows:
+            return 0.0
+        return sum(1 for row in rows if row["outcome"] == "failed" or row["attempts"] > 1) / len(rows)
+
+    @property
+    def flake_rate(self):
+        return self.flake_rate_of(self.rows)
+
+    @property
+    def flaky(self):
+        passed = any(row["outcome"] == "passed" for row in self.rows)
+        return passed and self.flake_rate > 0
+
+    def trends(self):
+        """Reasons this test looks worse in the newer half of its history"""
+        if len(self.rows) < 4:
+            return []
+        half = len(self.rows) // 2
+        older, newer = self.rows[:half], self.rows[half:]
+        found = []
+        before, now = self.flake_rate_of(older), self.flake_rate_of(newer)
+        if now > before:
+            found.append(f"flake rate {before:.0%} -> {now:.0%}")
+        before = statistics.median(row["duration"] for row in older)
+        now = statistics.median(row["duration"] for row in newer)
+        if before and now > before * (1 + DURATION_TREND):
+            found.append(f"median duration {before:.2f}s -> {now:.2f}s")
+        return found
+
+
+def connect(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def load(path, window):
+    """History of every test over the last `window` runs"""
+    if not os.path.exists(path):
+        return {}
+    connection = connect(path)
+    try:
+        rows = connection.execute(
+            "SELECT test, outcome, duration, attempts FROM results"
+            " WHERE run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)"
+            " ORDER BY run_id",
+            (window,),
+        ).fetchall()
+    finally:
+        connection.close()
+    history = {}
+    for row in rows:
+        history.setdefault(row["test"], []).append(dict(row))
+    return {test: History(rows) for test, rows in history.items()}
+
+
+def save(path, outcomes):
+    """Store the outcome of every test of this run as a new run"""
+    connection = connect(path)
+    try:
+        with connection:
+            run_id = connection.execute(
+                "INSERT INTO runs (started_at) VALUES (?)", (time.strftime("%Y-%m-%dT%H:%M:%S"),),
+            ).lastrowid
+            connection.executemany(
+                "INSERT INTO results (run_id, test, outcome, duration, attempts) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, test, o["outcome"], o["duration"], o["attempts"]) for test, o in outcomes.items()],
+            )
+    finally:
+        connection.close()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("history")
+    group.addoption("--history-db", default="results/history.sqlite", help="SQLite file with past test results")
+    group.addoption("--history-window", type=int, default=20, help="number of recent runs to look at (default 20)")
+    group.addoption("--flaky-retries", type=int, default=2,
+                    help="how often to retry a test known to be flaky (default 2)")
+    group.addoption("--no-history", action="store_true", help="neither use nor record test history")
+
+
+def database(config):
+    return os.path.join(SUITE_ROOT, config.getoption("history_db"))
+
+
+def pytest_configure(config):
+    _history.clear()
+    _outcomes.clear()
+    if not config.getoption("no_history"):
+        _history.update(load(database(config), config.getoption("history_window")))
+
+
+def pytest_collection_modifyitems(session, config, items):
+    if not _history:
+        return
+    known = [history.median_duration for history in _history.values()]
+    average = statistics.mean(known)
+
+    def expected(item):
+        history = _history.get(item.nodeid)
+        return history.median_duration if history else average
+
+    # Every xdist worker sorts the same way, so collections stay identical
+    scheduled = sorted((item for item in items if not item.get_closest_marker("scalability")), key=expected, reverse=True)
+    items[:] = scheduled + [item for item in items if item.get_closest_marker("scalability")]
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    history = _history.get(item.nodeid)
+    retries = item.config.getoption("flaky_retries")
+    if not history or not history.flaky or retries <= 0:
+        return None
+
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    for attempt in range(1, retries + 2):
+        reports = runtestprotocol(item, nextitem=nextitem, log=False)
+        if not any(report.failed for report in reports) or attempt > retries:
+            break
+    for report in reports:
+        report.user_properties.append(("attempts", attempt))
+        item.ihook.pytest_runtest_logreport(report=report)
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    return True
+
+
+def pytest_runtest_logreport(report):
+    outcome = _outcomes.setdefault(report.nodeid, {"outcome": "passed", "duration": 0.0, "attempts": 1})
+    outcome["duration"] += report.duration
+    outcome["attempts"] = dict(report.user_properties).get("attempts", outcome["attempts"])
+    if report.failed:
+        outcome["outcome"] = "failed"
+    elif report.skipped and outcome["outcome"] == "passed":
+        outcome["outcome"] = "skipped"
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    # Under xdist the controller receives every worker's reports and saves them
+    if reporting.is_worker(config) or config.getoption("no_history"):
+        return
+    outcomes = {test: o for test, o in _outcomes.items() if o["outcome"] != "skipped"}
+    if outcomes:
+        save(database(config), outcomes)
+
+    for test, outcome in outcomes.items():
+        if outcome["attempts"] > 1:
+            reporting.record("history", test=test, note=f"{outcome['outcome']} after {outcome['attempts']} attempts")
+    for test, history in sorted(_history.items()):
+        for trend in history.trends():
+            reporting.record("history", test=test, note=trend)
+
+
+@reporting.summary("history", "test history")
+def render(terminalreporter, entries):
+    for entry in entries:
+        terminalreporter.write_line(f"{entry['note']:<40}  {entry['test']}")
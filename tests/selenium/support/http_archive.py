@@ -0,0 +1,278 @@
+"""Record the application's responses once and replay them without a backend.
+
+`--http-archive record` puts a small proxy in front of the application (real
+or stand-in) and hands its URL to the tests, so every request the browsers
+and HTTP clients make passes through it: HTML documents, Inertia page
+payloads, `/api/currency/rates`, form POSTs and the built assets. Each
+response is stored under the running test and the request (method, path and
+query, Inertia or not, and a digest of the request body), in the order it
+was served. Bodies are stored once however often they were served, and the
+archive is gzipped JSON (results/http-archive.json.gz by default).
+
+`--http-archive replay` serves the same URL from the archive alone, so UI
+tests that only check rendering run with no backend at all. A test gets its
+own recorded responses in order; a request recorded under another test (a
+session-scoped login, for example) gets that test's first response. Requests
+with no recording get a 404 and are listed under "http archive" in the
+summary. `--http-archive passthrough` (the default) talks to the application
+directly.
+
+Absolute URLs of the proxy in headers and bodies are stored as placeholders,
+so the replay works on whatever port the proxy gets.
+"""
+import base64
+import glob
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+
+from support import parallel, reporting
+
+SUITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ORIGIN = "{{origin}}"
+JSON_ORIGIN = "{{json-origin}}"  # json_encode escapes slashes
+HOP_BY_HOP = {"connection", "keep-alive", "transfer-encoding", "proxy-connection", "te", "upgrade", "content-length"}
+
+_test = None
+
+
+def request_key(method, target, inertia, body):
+    """How a request is looked up in the archive"""
+    parts = [method, target]
+    if inertia:
+        parts.append("inertia")
+    if body:
+        parts.append(hashlib.sha256(body).hexdigest()[:16])
+    return " ".join(parts)
+
+
+def template(text, origin):
+    return text.replace(origin, ORIGIN).replace(origin.replace("/", "\\/"), JSON_ORIGIN)
+
+
+def fill(text, origin):
+    return text.replace(ORIGIN, origin).replace(JSON_ORIGIN, origin.replace("/", "\\/"))
+
+
+class Archive:
+    """Responses per test and request key, with every distinct body stored once"""
+
+    def __init__(self, entries=None, bodies=None):
+        self.entries = entries or {}
+        self.bodies = bodies or {}
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            data = json.load(handle)
+        return cls(data["entries"], data["bodies"])
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as handle:
+            json.dump({"version": 1, "entries": self.entries, "bodies": self.bodies}, handle, separators=(",", ":"))
+
+    def merge(self, other):
+        for test, requests in other.entries.items():
+            for key, responses in requests.items():
+                self.entries.setdefault(test, {}).setdefault(key, []).extend(responses)
+        self.bodies.update(other.bodies)
+
+    def add(self, test, key, status, headers, body, origin):
+        try:
+            stored = {"text": template(body.decode("utf-8"), origin)}
+        except UnicodeDecodeError:
+            stored = {"base64": base64.b64encode(body).decode("ascii")}
+        digest = hashlib.sha256(json.dumps(stored, sort_keys=True).encode()).hexdigest()
+        self.bodies.setdefault(digest, stored)
+        self.entries.setdefault(test or "", {}).setdefault(key, []).append({
+            "status": status,
+            "headers": [[name, template(value, origin)] for name, value in headers],
+            "body": digest,
+        })
+
+    def body(self, digest, origin):
+        stored = self.bodies[digest]
+        if "text" in stored:
+            return fill(stored["text"], origin).encode("utf-8")
+        return base64.b64decode(stored["base64"])
+
+    @property
+    def responses(self):
+        return sum(len(responses) for requests in self.entries.values() for responses in requests.values())
+
+
+class Proxy:
+    """Forwards and records, or answers from the archive"""
+
+    def __init__(self, mode, archive, upstream=None):
+        self.mode = mode
+        self.archive = archive
+        self.upstream = urlsplit(upstream) if upstream else None
+        self.origin = None  # Set once the server is listening
+        self.lock = threading.Lock()
+        self.cursors = {}
+        self.hits = 0
+        self.fallbacks = 0
+        self.misses = []
+
+    def handle(self, method, target, headers, body):
+        key = request_key(method, target, "x-inertia" in {name.lower() for name, _ in headers}, body)
+        if self.mode == "replay":
+            return self.replay(key)
+        status, response_headers, response_body = self.forward(method, target, headers, body)
+        with self.lock:
+            self.archive.add(_test, key, status, response_headers, response_body, self.origin)
+        return status, response_headers, response_body
+
+    def forward(self, method, target, headers, body):
+        connection = http.client.HTTPConnection(self.upstream.hostname, self.upstream.port or 80, timeout=30)
+        try:
+            # No Accept-Encoding: bodies must arrive uncompressed to be templated
+            forwarded = {name: value for name, value in headers
+                         if name.lower() not in HOP_BY_HOP and name.lower() != "accept-encoding"}
+            connection.request(method, target, body=body or None, headers=forwarded)
+            response = connection.getresponse()
+            data = response.read()
+            return response.status, [(name, value) for name, value in response.getheaders()
+                                     if name.lower() not in HOP_BY_HOP], data
+        finally:
+            connection.close()
+
+    def replay(self, key):
+        with self.lock:
+            responses = self.archive.entries.get(_test or "", {}).get(key)
+            if responses:
+                cursor = self.cursors.get((_test, key), 0)
+                self.cursors[(_test, key)] = cursor + 1
+                response = responses[min(cursor, len(responses) - 1)]
+                self.hits += 1
+            else:
+                response = next((requests[key][0] for requests in self.archive.entries.values() if key in requests), None)
+                if response is None:
+                    self.misses.append(f"{_test}: {key}")
+                    return 404, [("Content-Type", "text/plain")], f"No recording for {key}".encode()
+                self.fallbacks += 1
+        headers = [(name, fill(value, self.origin)) for name, value in response["headers"]]
+        return response["status"], headers, self.archive.body(response["body"], self.origin)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    proxy = None
+
+    def dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, data = self.proxy.handle(self.command, self.path, list(self.headers.items()), body)
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    do_GET = do_POST = do_HEAD = do_PUT = do_PATCH = do_DELETE = dispatch
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start(proxy, host="127.0.0.1"):
+    """Serve the proxy from a background thread and return the server"""
+    server = ThreadingHTTPServer((host, 0), type("ArchiveHandler", (Handler,), {"proxy": proxy}))
+    server.daemon_threads = True
+    proxy.origin = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, name="http-archive", daemon=True).start()
+    return server
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("http archive")
+    group.addoption("--http-archive", choices=["record", "replay", "passthrough"],
+                    default=os.environ.get("SELENIUM_HTTP_ARCHIVE", "passthrough"),
+                    help="record the application's responses, replay them without a backend, or neither")
+    group.addoption("--http-archive-path", default="results/http-archive.json.gz", help="where the archive is kept")
+
+
+def resolve(config):
+    return os.path.join(SUITE_ROOT, config.getoption("http_archive_path"))
+
+
+def pytest_runtest_logstart(nodeid, location):
+    global _test
+    _test = nodeid
+
+
+@pytest.fixture(scope="session")
+def app_url(request):
+    """Base URL the tests use: the application, or the archive proxy in front of it"""
+    mode = request.config.getoption("http_archive")
+    if mode == "passthrough":
+        yield request.getfixturevalue("upstream_url")
+        return
+
+    path = resolve(request.config)
+    if mode == "replay":
+        if not os.path.exists(path):
+            pytest.exit(f"No HTTP archive at {path}; record one with --http-archive record", returncode=4)
+        proxy = Proxy(mode, Archive.load(path))
+    else:
+        proxy = Proxy(mode, Archive(), request.getfixturevalue("upstream_url"))
+    server = start(proxy)
+
+    yield proxy.origin
+
+    server.shutdown()
+    server.server_close()
+    if mode == "record":
+        # xdist workers each write a part, merged by the controller at the end
+        worker = parallel.worker_id()
+        proxy.archive.save(path if worker == "master" else f"{path}.{worker}")
+        reporting.record("http archive", mode=mode, responses=proxy.archive.responses,
+                         bodies=len(proxy.archive.bodies), misses=[])
+    else:
+        reporting.record("http archive", mode=mode, responses=proxy.hits + proxy.fallbacks,
+                         fallbacks=proxy.fallbacks, misses=proxy.misses)
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if config.getoption("http_archive") != "record" or not config.pluginmanager.hasplugin("dsession"):
+        return
+    path = resolve(config)
+    parts = sorted(glob.glob(glob.escape(path) + ".gw*"))
+    if not parts:
+        return
+    archive = Archive()
+    for part in parts:
+        archive.merge(Archive.load(part))
+        os.remove(part)
+    archive.save(path)
+
+
+@reporting.summary("http archive", "http archive")
+def render(terminalreporter, entries):
+    mode = entries[0]["mode"]
+    responses = sum(entry["responses"] for entry in entries)
+    if mode == "record":
+        bodies = sum(entry["bodies"] for entry in entries)
+        terminalreporter.write_line(f"recorded {responses} responses ({bodies} distinct bodies)")
+        return
+    fallbacks = sum(entry["fallbacks"] for entry in entries)
+    misses = [miss for entry in entries for miss in entry["misses"]]
+    terminalreporter.write_line(
+        f"replayed {responses} responses ({fallbacks} recorded under another test), {len(misses)} without a recording"
+    )
+    for miss in sorted(set(misses)):
+        terminalreporter.write_line(f"  no recording  {miss}")
@@ -0,0 +1,53 @@
+"""Element lookups with an explicit policy instead of a global implicit wait.
+
+`expect` is for elements the test needs: it waits up to a bounded timeout and
+fails when the element never shows up. `probe` is for elements that may or
+may not be there: it answers immediately. Implicit waits are disabled for the
+whole suite, so a missing optional element never stalls a test. Every
+`expect` that runs out of time is listed in the summary.
+"""
+import os
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from support import reporting
+
+
+class Lookup:
+    """Finds elements using "expect present" and "probe" semantics"""
+
+    def __init__(self, driver, timeout=10, poll=0.05):
+        self.driver = driver
+        self.timeout = timeout
+        self.poll = poll
+
+    def expect(self, locator, condition=EC.presence_of_element_located, timeout=None):
+        """Wait for an element the test requires, failing after a bounded timeout"""
+        timeout = self.timeout if timeout is None else timeout
+        started = time.perf_counter()
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=self.poll).until(condition(locator))
+        except TimeoutException:
+            reporting.record(
+                "lookup timeouts",
+                test=os.environ.get("PYTEST_CURRENT_TEST", "").rsplit(" ", 1)[0],
+                locator=f"{locator[0]}={locator[1]}",
+                seconds=time.perf_counter() - started,
+            )
+            raise
+
+    def probe(self, locator):
+        """Return the element if it is on the page right now, otherwise None"""
+        elements = self.driver.find_elements(*locator)
+        return elements[0] if elements else None
+
+
+@reporting.summary("lookup timeouts", "lookups that hit their timeout")
+def render(terminalreporter, entries):
+    for entry in entries:
+        terminalreporter.write_line(
+            f"{entry['seconds']:6.2f}s  {entry['locator']}  in {entry['test']}"
+        )
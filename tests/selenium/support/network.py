@@ -0,0 +1,142 @@
+"""Network policy for the test browsers.
+
+None of the assertions depend on web fonts, images or anything served by
+another host. Every pooled browser blocks web fonts and images through the
+DevTools protocol, and is launched with host resolver rules that fail the
+lookup of every host name except the application's. Third-party requests,
+such as the fonts.bunny.net stylesheet, never leave the browser and are
+counted as blocked. A request to a bare IP address skips the lookup and is
+not caught. After launch each browser also fetches every bundle listed in the
+Vite manifest once, so the page chunks for resources/js/pages/*.tsx are
+already in its HTTP cache when a test first opens a page.
+
+Each navigation to an application page is summarised from Chrome's
+performance log: requests made, requests blocked, responses served from the
+cache and bytes transferred versus bytes served from the cache. Pass
+`--no-network-policy` to load every resource and skip the warm-up, e.g. to
+compare page load times with and without it.
+"""
+import json
+import time
+from urllib.parse import urlparse
+
+from selenium.webdriver.remote.command import Command
+
+from support import reporting
+
+BLOCKED_URLS = [
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+]
+
+WARM_CACHE = """
+const done = arguments[arguments.length - 1];
+fetch('/build/manifest.json')
+    .then((response) => response.ok ? response.json() : {})
+    .then((manifest) => {
+        const files = new Set();
+        for (const chunk of Object.values(manifest)) {
+            files.add(chunk.file);
+            (chunk.css || []).forEach((file) => files.add(file));
+        }
+        return Promise.all([...files].map((file) =>
+            fetch('/build/' + file).then((response) => response.blob()).then((blob) => blob.size, () => 0)));
+    })
+    .then((sizes) => done({files: sizes.length, bytes: sizes.reduce((a, b) => a + b, 0)}),
+          () => done({files: 0, bytes: 0}));
+"""
+
+
+def pytest_addoption(parser):
+    parser.getgroup("network").addoption(
+        "--no-network-policy", action="store_true", help="load fonts, images and other hosts, and skip the cache warm-up",
+    )
+
+
+def origin_only(origin):
+    """Chrome argument that fails the DNS lookup of every host but the origin's"""
+    return f"--host-resolver-rules=MAP * ~NOTFOUND , EXCLUDE {urlparse(origin).hostname}"
+
+
+def block(driver):
+    """Block fonts, images and third-party stylesheets for this browser"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+
+
+def warm(driver, origin):
+    """Fetch every bundle in the Vite manifest into the browser's HTTP cache"""
+    started = time.perf_counter()
+    # Not driver.get: this must not count as the browser's first navigation
+    driver.execute(Command.GET, {"url": origin + "/robots.txt"})
+    warmed = driver.execute_async_script(WARM_CACHE)
+    reporting.record(
+        "startup",
+        phase="cache warm-up",
+        seconds=time.perf_counter() - started,
+        detail=f"{warmed['files']} files, {warmed['bytes'] / 1024:.0f} KB",
+    )
+
+
+def drain(driver):
+    """Discard the performance log collected so far"""
+    driver.get_log("performance")
+
+
+def messages(driver):
+    """DevTools events from the performance log since it was last read"""
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        yield entry["timestamp"], message["method"], message.get("params", {})
+
+
+def navigation(driver, url):
+    """Record what the browser loaded, blocked and took from cache for a page"""
+    recorder = getattr(driver, "blackbox", None)
+    requests, blocked, cached = set(), set(), set()
+    transferred = from_cache = 0
+    for timestamp, method, params in messages(driver):
+        if recorder is not None:
+            recorder.network(timestamp, method, params)
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            requests.add(request_id)
+        elif method == "Network.requestServedFromCache":
+            cached.add(request_id)
+        elif method == "Network.responseReceived":
+            if params["response"].get("fromDiskCache") or params["response"].get("fromPrefetchCache"):
+                cached.add(request_id)
+        elif method == "Network.loadingFailed" and (
+                params.get("blockedReason") or params.get("errorText") == "net::ERR_NAME_NOT_RESOLVED"):
+            blocked.add(request_id)  # By BLOCKED_URLS, or another host (see origin_only)
+        elif method == "Network.dataReceived" and request_id in cached:
+            from_cache += params["dataLength"]
+        elif method == "Network.loadingFinished":
+            transferred += params["encodedDataLength"]
+
+    reporting.record(
+        "network",
+        page=urlparse(url).path or "/",
+        requests=len(requests),
+        blocked=len(blocked),
+        cached=len(cached),
+        transferred=transferred,
+        from_cache=from_cache,
+    )
+
+
+@reporting.summary("network", "network per page")
+def render(terminalreporter, entries):
+    pages = {}
+    for entry in entries:
+        pages.setdefault(entry["page"], []).append(entry)
+    terminalreporter.write_line(
+        f"{'page':<14}{'loads':>6}{'requests':>10}{'blocked':>9}{'cached':>8}{'KB down':>10}{'KB cached':>11}"
+    )
+    for page, loads in sorted(pages.items()):
+        def total(key):
+            return sum(load[key] for load in loads)
+        terminalreporter.write_line(
+            f"{page:<14}{len(loads):>6}{total('requests'):>10}{total('blocked'):>9}{total('cached'):>8}"
+            f"{total('transferred') / 1024:>10.0f}{total('from_cache') / 1024:>11.0f}"
+        )
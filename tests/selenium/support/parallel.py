@@ -0,0 +1,66 @@
+"""Parallel execution support built on pytest-xdist.
+
+`pytest -n auto` starts one worker per CPU core (capped by the
+SELENIUM_MAX_WORKERS environment variable). Each worker records how long it
+spent running tests so the summary can show how evenly the load was spread.
+"""
+import os
+import time
+
+import pytest
+
+from support import reporting
+
+_started = None
+_busy = 0.0
+_tests = 0
+
+
+def worker_id():
+    """Name of the current xdist worker, or "master" when not sharded"""
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    workers = os.cpu_count() or 1
+    limit = os.environ.get("SELENIUM_MAX_WORKERS")
+    if limit:
+        workers = min(workers, int(limit))
+    return workers
+
+
+def pytest_sessionstart(session):
+    global _started, _busy, _tests
+    _started = time.perf_counter()
+    _busy, _tests = 0.0, 0
+
+
+def pytest_runtest_logreport(report):
+    global _busy, _tests
+    _busy += report.duration
+    if report.when == "call":
+        _tests += 1
+
+
+def pytest_sessionfinish(session):
+    if session.config.pluginmanager.hasplugin("dsession") or not _tests:
+        return  # The xdist controller runs no tests itself
+    reporting.record(
+        "workers",
+        worker=worker_id(),
+        tests=_tests,
+        busy=_busy,
+        wall=time.perf_counter() - _started,
+    )
+
+
+@reporting.summary("workers", "worker utilisation")
+def render(terminalreporter, entries):
+    for entry in sorted(entries, key=lambda e: e["worker"]):
+        utilisation = entry["busy"] / entry["wall"] * 100 if entry["wall"] else 0.0
+        terminalreporter.write_line(
+            f"{entry['worker']:>8}  {entry['tests']:>4} tests  "
+            f"busy {entry['busy']:7.2f}s / wall {entry['wall']:7.2f}s  "
+            f"{utilisation:5.1f}%"
+        )
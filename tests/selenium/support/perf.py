@@ -0,0 +1,198 @@
+"""Per-test performance data and a regression gate against a stored baseline.
+
+For every test this records the setup/call/teardown wall time and the number
+and total latency of WebDriver commands. For every `driver.get` of one of the
+application pages it records the browser's Navigation Timing and paint
+metrics. The results are written to `--perf-output` as JSON and compared with
+`--perf-baseline`: a test or page that got slower than the baseline by more
+than `--perf-threshold` (and by at least `--perf-min-delta-ms`) is reported,
+and fails the run when `--perf-gate fail` is set.
+
+    pytest --perf-output results/perf.json --perf-baseline results/perf-baseline.json
+    pytest --perf-save-baseline                     # make this run the new baseline
+"""
+import json
+import os
+import statistics
+import time
+from urllib.parse import urlparse
+
+import pytest
+
+from support import reporting
+
+PAGES = ("/", "/donate", "/admin/login", "/admin")
+SUITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+NAVIGATION_TIMING = """
+const nav = performance.getEntriesByType('navigation')[0];
+const paint = Object.fromEntries(performance.getEntriesByType('paint').map((e) => [e.name, e.startTime]));
+return nav ? {
+    ttfb_ms: nav.responseStart,
+    dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+    load_ms: nav.loadEventEnd,
+    transfer_bytes: nav.transferSize,
+    first_paint_ms: paint['first-paint'] ?? null,
+    first_contentful_paint_ms: paint['first-contentful-paint'] ?? null,
+} : null;
+"""
+
+_phases = {}
+_commands = {"count": 0, "seconds": 0.0}
+_recording = True
+_regressions = []
+
+
+def command(seconds):
+    """Count one WebDriver command for the running test"""
+    _commands["count"] += 1
+    _commands["seconds"] += seconds
+
+
+def navigation(driver, url):
+    """Record Navigation Timing and paint metrics after loading an app page"""
+    path = urlparse(url).path or "/"
+    if path not in PAGES:
+        return
+    timing = driver.execute_script(NAVIGATION_TIMING)
+    if timing:
+        reporting.record("perf pages", page=path, **timing)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf")
+    group.addoption("--perf-output", default="results/perf.json", help="where to write per-test performance data")
+    group.addoption("--perf-baseline", default="results/perf-baseline.json", help="results file to compare against")
+    group.addoption("--perf-threshold", type=float, default=0.25,
+                    help="allowed slowdown against the baseline, as a fraction (default 0.25)")
+    group.addoption("--perf-min-delta-ms", type=float, default=100,
+                    help="ignore slowdowns smaller than this many milliseconds (default 100)")
+    group.addoption("--perf-gate", choices=["warn", "fail"], default="warn",
+                    help="whether a regression only warns or fails the run")
+    group.addoption("--perf-save-baseline", action="store_true", help="also write the results as the new baseline")
+
+
+def pytest_sessionstart(session):
+    global _recording
+    _regressions.clear()
+    # The xdist controller only sees reports forwarded by the workers
+    _recording = not session.config.pluginmanager.hasplugin("dsession")
+
+
+def pytest_runtest_logstart(nodeid, location):
+    _phases.clear()
+    _commands.update(count=0, seconds=0.0)
+
+
+def pytest_runtest_logreport(report):
+    _phases[report.when] = report.duration
+    if report.failed:
+        _phases["failed"] = True
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    if not _recording:
+        return
+    reporting.record(
+        "perf tests",
+        test=nodeid,
+        setup=_phases.get("setup", 0.0),
+        call=_phases.get("call", 0.0),
+        teardown=_phases.get("teardown", 0.0),
+        commands=_commands["count"],
+        command_seconds=_commands["seconds"],
+        failed=_phases.get("failed", False),
+    )
+
+
+def results():
+    """Per-test and per-page results of this run"""
+    tests = {}
+    for entry in reporting.entries("perf tests"):
+        wall = entry["setup"] + entry["call"] + entry["teardown"]
+        tests[entry["test"]] = dict(entry, wall=wall)
+        del tests[entry["test"]]["test"]
+
+    pages = {}
+    for entry in reporting.entries("perf pages"):
+        pages.setdefault(entry["page"], []).append(entry)
+    metrics = ("ttfb_ms", "dom_content_loaded_ms", "load_ms", "first_paint_ms", "first_contentful_paint_ms")
+    summary = {}
+    for page, samples in pages.items():
+        summary[page] = {"samples": len(samples)}
+        for metric in metrics:
+            values = [s[metric] for s in samples if s.get(metric) is not None]
+            summary[page][metric] = statistics.median(values) if values else None
+    return {"tests": tests, "pages": summary}
+
+
+def regressions(current, baseline, threshold, min_delta_ms):
+    """Tests and pages that are slower than the baseline beyond the threshold"""
+    found = []
+
+    def check(name, now, before):
+        if now is None or before is None:
+            return
+        if now > before * (1 + threshold) and now - before >= min_delta_ms:
+            found.append(f"{name}: {before:.0f}ms -> {now:.0f}ms (+{(now / before - 1) * 100 if before else 0:.0f}%)")
+
+    for test, stats in current["tests"].items():
+        before = baseline.get("tests", {}).get(test)
+        if before and not stats["failed"]:
+            check(test, stats["wall"] * 1000, before["wall"] * 1000)
+    for page, stats in current["pages"].items():
+        before = baseline.get("pages", {}).get(page)
+        if before:
+            check(f"{page} load", stats["load_ms"], before["load_ms"])
+            check(f"{page} first contentful paint", stats["first_contentful_paint_ms"], before["first_contentful_paint_ms"])
+    return found
+
+
+def resolve(config, option):
+    """Option path, relative to the Selenium suite directory"""
+    return os.path.join(SUITE_ROOT, config.getoption(option))
+
+
+def write(path, document):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as handle:
+        json.dump(document, handle, indent=2, sort_keys=True)
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if reporting.is_worker(config) or not reporting.entries("perf tests"):
+        return
+
+    current = dict(results(), recorded_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    write(resolve(config, "perf_output"), current)
+
+    baseline_path = resolve(config, "perf_baseline")
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as handle:
+            baseline = json.load(handle)
+        _regressions.extend(regressions(
+            current, baseline, config.getoption("perf_threshold"), config.getoption("perf_min_delta_ms"),
+        ))
+        if _regressions and config.getoption("perf_gate") == "fail":
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    if config.getoption("perf_save_baseline"):
+        write(baseline_path, current)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if reporting.is_worker(config) or not reporting.entries("perf tests"):
+        return
+    terminalreporter.write_sep("-", "performance")
+    tests = results()["tests"]
+    slowest = sorted(tests.items(), key=lambda item: -item[1]["wall"])[:5]
+    for test, stats in slowest:
+        terminalreporter.write_line(
+            f"{stats['wall']:6.2f}s (setup {stats['setup']:.2f} / call {stats['call']:.2f} / "
+            f"teardown {stats['teardown']:.2f})  {stats['commands']:>4} commands "
+            f"{stats['command_seconds']:6.2f}s  {test}"
+        )
+    terminalreporter.write_line(f"results written to {resolve(config, 'perf_output')}")
+    for regression in _regressions:
+        terminalreporter.write_line(f"REGRESSION {regression}", red=True)
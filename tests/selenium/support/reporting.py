@@ -0,0 +1,72 @@
+"""Collects suite statistics and prints them in the terminal summary.
+
+Entries are recorded per process. Under pytest-xdist each worker ships its
+entries to the controller when it shuts down, so the summary always covers
+the whole run. Entries are dropped when a run is configured, so a process
+that runs pytest repeatedly (support.watch) reports each run on its own.
+"""
+import pytest
+
+_entries = {}
+_summaries = []
+
+
+def record(section, **entry):
+    """Record one entry under the given report section"""
+    _entries.setdefault(section, []).append(entry)
+
+
+def entries(section):
+    """Return every entry recorded for a section"""
+    return _entries.get(section, [])
+
+
+def export():
+    """Return all entries in a form that can be sent between processes"""
+    return {section: list(items) for section, items in _entries.items()}
+
+
+def merge(data):
+    """Add entries exported by another process"""
+    for section, items in data.items():
+        _entries.setdefault(section, []).extend(items)
+
+
+def summary(section, title):
+    """Register a function that renders a section in the terminal summary"""
+    def register(render):
+        _summaries.append((section, title, render))
+        return render
+    return register
+
+
+def is_worker(config):
+    """True when running inside a pytest-xdist worker process"""
+    return hasattr(config, "workeroutput")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # Before any other plugin's pytest_configure, which may already record entries
+    _entries.clear()
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    if is_worker(session.config):
+        session.config.workeroutput["report"] = export()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    merge(getattr(node, "workeroutput", {}).get("report", {}))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if is_worker(config):
+        return
+    for section, title, render in _summaries:
+        items = entries(section)
+        if items:
+            terminalreporter.write_sep("-", title)
+            render(terminalreporter, items)
@@ -0,0 +1,85 @@
+"""Dataset sizing for the scalability tests.
+
+`--dataset-sizes 1000,10000,100000` runs test_scalability.py once per size.
+Before each size the donations table is replaced by BulkDonationSeeder, which
+bulk-inserts rows in chunks instead of going through the UI or the API. The
+seeding command runs in the application root and gets the row count in the
+DONATION_SEED_COUNT environment variable, so for the Docker setup use e.g.
+
+    --seed-command "docker exec -e DONATION_SEED_COUNT laravel_app php artisan db:seed --class=BulkDonationSeeder --force"
+
+Without --dataset-sizes the scalability tests are skipped. They replace all
+donations, so run them on their own and not in parallel.
+"""
+import os
+import shlex
+import subprocess
+import time
+
+import pytest
+
+from support import reporting
+
+SEED_COMMAND = "php artisan db:seed --class=BulkDonationSeeder --force"
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("scalability")
+    group.addoption("--dataset-sizes", default=None,
+                    help="comma-separated donation counts to run test_scalability.py with, e.g. 1000,10000,100000")
+    group.addoption("--seed-command", default=os.environ.get("SEED_COMMAND", SEED_COMMAND),
+                    help="command that bulk-seeds DONATION_SEED_COUNT donations")
+
+
+def pytest_generate_tests(metafunc):
+    if "dataset_size" in metafunc.fixturenames:
+        option = metafunc.config.getoption("dataset_sizes")
+        sizes = [int(size) for size in option.split(",")] if option else []
+        metafunc.parametrize("dataset_size", sizes, ids=[f"{size}-donations" for size in sizes], scope="module")
+
+
+def seed(command, size, env=None):
+    """Replace the donations table with `size` generated rows"""
+    started = time.perf_counter()
+    subprocess.run(
+        shlex.split(command),
+        cwd=APP_ROOT,
+        env=dict(env or os.environ, DONATION_SEED_COUNT=str(size)),
+        check=True,
+        capture_output=True,
+    )
+    seconds = time.perf_counter() - started
+    reporting.record("scalability", size=size, metric="seed", value=seconds)
+    return seconds
+
+
+@pytest.fixture(scope="module")
+def seeded_donations(request, dataset_size):
+    """Number of donations in the database after seeding for this size"""
+    if request.config.getoption("app") == "standin" or request.config.getoption("http_archive") == "replay":
+        pytest.skip("seeding needs the real application's database")
+    env = request.getfixturevalue("isolated_app").environment if request.config.getoption("app") == "isolated" else None
+    seed(request.config.getoption("seed_command"), dataset_size, env)
+    return dataset_size
+
+
+@reporting.summary("scalability", "scalability by dataset size")
+def render(terminalreporter, entries):
+    columns = [
+        ("seed", "seed s", 1),
+        ("api_ms", "api ms", 1),
+        ("api_bytes", "api KB", 1 / 1024),
+        ("dashboard_ms", "dashboard ms", 1),
+        ("dashboard_rows", "rows shown", 1),
+    ]
+    table = {}
+    for entry in entries:
+        table.setdefault(entry["size"], {})[entry["metric"]] = entry["value"]
+    terminalreporter.write_line(f"{'donations':>10}" + "".join(f"{title:>14}" for _, title, _ in columns))
+    for size in sorted(table):
+        cells = ""
+        for metric, _, scale in columns:
+            value = table[size].get(metric)
+            cells += f"{value * scale:>14.1f}" if value is not None else f"{'-':>14}"
+        terminalreporter.write_line(f"{size:>10}" + cells)
@@ -0,0 +1,96 @@
+"""Cached admin session shared by every test in a worker.
+
+The admin logs in once over plain HTTP and the Laravel session and XSRF
+cookies are kept. Tests that need an admin get those cookies injected
+straight into the browser, which skips the login form, the bcrypt check
+and the redirect. When the server rejects the cached session (for example
+after a test logged out) the session is re-created and injected again.
+"""
+import time
+from urllib.parse import unquote
+
+import requests
+from selenium.webdriver.common.by import By
+
+from support import reporting
+from support.lookups import Lookup
+from support.waits import Waiter
+
+ADMIN_EMAIL = "admin@example.com"
+ADMIN_PASSWORD = "admin"
+
+
+class AdminSession:
+    """Logs the admin in once and replays the session cookies into browsers"""
+
+    def __init__(self, base_url, email=ADMIN_EMAIL, password=ADMIN_PASSWORD):
+        self.base_url = base_url
+        self.email = email
+        self.password = password
+        self.cookies = None
+
+    def login(self):
+        """Log in over HTTP and keep the resulting session cookies"""
+        started = time.perf_counter()
+        with requests.Session() as http:
+            http.get(f"{self.base_url}/admin/login")
+            token = unquote(http.cookies.get("XSRF-TOKEN", ""))
+            response = http.post(
+                f"{self.base_url}/admin/login",
+                data={"email": self.email, "password": self.password},
+                headers={"X-XSRF-TOKEN": token, "Accept": "text/html"},
+                allow_redirects=False,
+            )
+            location = response.headers.get("Location", "")
+            if response.status_code != 302 or location.rstrip("/").endswith("/admin/login"):
+                raise RuntimeError(f"Admin login was rejected ({response.status_code} -> {location or 'no redirect'})")
+            self.cookies = [{"name": c.name, "value": c.value} for c in http.cookies]
+        reporting.record("admin sessions", via="http", seconds=time.perf_counter() - started)
+
+    def login_via_ui(self, driver):
+        """Log in through the form and keep the browser's session cookies"""
+        started = time.perf_counter()
+        driver.get(f"{self.base_url}/admin/login")
+        # The form is rendered by the application, not in the served HTML
+        Lookup(driver).expect((By.CSS_SELECTOR, "input[type='text']")).send_keys(self.email)
+        driver.find_element(By.CSS_SELECTOR, "input[type='password']").send_keys(self.password)
+        with Waiter(driver).visit("admin login form"):
+            driver.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
+        if "/admin/login" in driver.current_url:
+            raise RuntimeError("Admin login through the form was rejected")
+        self.cookies = [{"name": c["name"], "value": c["value"]} for c in driver.get_cookies()]
+        reporting.record("admin sessions", via="ui", seconds=time.perf_counter() - started)
+
+    def inject(self, driver):
+        """Put the cached session cookies into the browser without loading a page"""
+        driver.execute_cdp_cmd("Network.setCookies", {
+            "cookies": [dict(cookie, url=self.base_url, path="/") for cookie in self.cookies],
+        })
+
+    def authenticate(self, driver):
+        """Start a new admin session, over HTTP if possible and through the form otherwise"""
+        try:
+            self.login()
+        except (requests.RequestException, RuntimeError):
+            self.login_via_ui(driver)
+
+    def open(self, driver, path="/admin"):
+        """Open an admin page as the logged-in admin, re-authenticating if needed"""
+        if self.cookies is not None:
+            self.inject(driver)
+            driver.get(f"{self.base_url}{path}")
+            if "/admin/login" not in driver.current_url:
+                return
+
+        # No session yet, or the server no longer knows this one
+        self.authenticate(driver)
+        self.inject(driver)
+        driver.get(f"{self.base_url}{path}")
+
+
+@reporting.summary("admin sessions", "admin logins")
+def render(terminalreporter, entries):
+    for via in ("http", "ui"):
+        seconds = [e["seconds"] for e in entries if e["via"] == via]
+        if seconds:
+            terminalreporter.write_line(f"{len(seconds)} {via} logins took {sum(seconds):.2f}s")
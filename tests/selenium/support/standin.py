@@ -0,0 +1,508 @@
+"""In-process stand-in for the Laravel application.
+
+Running the suite against the real application needs PHP, a database and the
+currency API. `pytest --app standin` instead starts this small server inside
+each worker, on a random port, in a few milliseconds. It implements the routes
+of routes/web.php and routes/api.php the way the application does:
+
+* the Inertia protocol: an HTML shell with `data-page` for full loads, JSON
+  for `X-Inertia` visits, 409 on an asset version mismatch, validation errors
+  shared as the `errors` prop after redirecting back;
+* Laravel sessions and XSRF protection: `laravel_session` and `XSRF-TOKEN`
+  cookies, 419 when a web POST carries the wrong token;
+* the same validation rules and messages for donations and the admin login,
+  the `admin` guard on /admin, and the API's JSON shapes;
+* the currency fallback rates, because it never calls the currency API.
+
+The frontend is served from the committed Vite build in public/build, so
+`npm run build` is needed after changing resources/js. Data lives in memory
+for the lifetime of the server. `pytest --app real` (the default) runs against
+the application at `--app-url` instead. To try the stand-in by hand:
+
+    python -m support.standin --port 8000
+"""
+import argparse
+import hashlib
+import html
+import json
+import mimetypes
+import os
+import random
+import re
+import secrets
+import threading
+from datetime import datetime, timezone
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pytest
+
+from support import watch
+from support.sessions import ADMIN_EMAIL, ADMIN_PASSWORD
+
+BASE_URL = "http://localhost:8000"
+PUBLIC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "public"))
+
+APP_NAME = "Laravel"
+SESSION_COOKIE = "laravel_session"
+
+DONATION_RULES = {
+    "donor_name": ["required", "string", ("max", 255)],
+    "donor_email": ["required", "email", ("max", 255)],
+    "amount": ["required", "numeric", ("min", 0.01)],
+    "currency": ["nullable", "string", ("max", 3)],
+    "message": ["nullable", "string", ("max", 1000)],
+}
+LOGIN_RULES = {
+    "email": ["required", "string"],
+    "password": ["required", "string"],
+}
+BAD_CREDENTIALS = "The provided credentials do not match our records or you are not an admin."
+
+# CurrencyService::getFallbackRates
+RATES = {"USD": 1.0, "EUR": 0.92, "GBP": 0.79, "INR": 83.12}
+SYMBOLS = {"USD": "$", "EUR": "€", "GBP": "£", "INR": "₹"}
+
+QUOTES = [
+    ("Simplicity is the ultimate sophistication.", "Leonardo da Vinci"),
+    ("Well begun is half done.", "Aristotle"),
+    ("Nothing worth having comes easy.", "Theodore Roosevelt"),
+]
+
+
+def now():
+    """Timestamp as Laravel serialises it"""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000000Z")
+
+
+def numeric(value):
+    """PHP's is_numeric"""
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return True
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return value.strip().lower() not in ("nan", "inf", "-inf", "infinity")
+
+
+def validate(data, rules):
+    """Laravel validation: field -> messages, empty when everything passes"""
+    errors = {}
+    for field, checks in rules.items():
+        name = field.replace("_", " ")
+        value = data.get(field)
+        if value is None:
+            if "required" in checks:
+                errors[field] = [f"The {name} field is required."]
+            continue
+        messages = []
+        for check in checks:
+            if check == "string" and not isinstance(value, str):
+                messages.append(f"The {name} field must be a string.")
+            elif check == "email" and not (isinstance(value, str) and re.fullmatch(r"[^@\s]+@[^@\s]+", value)):
+                messages.append(f"The {name} field must be a valid email address.")
+            elif check == "numeric" and not numeric(value):
+                messages.append(f"The {name} field must be a number.")
+            elif isinstance(check, tuple) and check[0] == "max" and isinstance(value, str) and len(value) > check[1]:
+                messages.append(f"The {name} field must not be greater than {check[1]} characters.")
+            elif isinstance(check, tuple) and check[0] == "min" and numeric(value) and float(value) < check[1]:
+                messages.append(f"The {name} field must be at least {check[1]}.")
+        if messages:
+            errors[field] = messages
+    return errors
+
+
+def normalize(data):
+    """TrimStrings and ConvertEmptyStringsToNull"""
+    cleaned = {}
+    for key, value in data.items():
+        if isinstance(value, str):
+            value = value.strip() or None
+        cleaned[key] = value
+    return cleaned
+
+
+class Assets:
+    """Script and style tags for a page, as the @vite directive renders them"""
+
+    def __init__(self, public=PUBLIC):
+        path = os.path.join(public, "build", "manifest.json")
+        self.manifest = {}
+        self.version = None
+        if os.path.exists(path):
+            with open(path, "rb") as handle:
+                content = handle.read()
+            self.manifest = json.loads(content)
+            self.version = hashlib.md5(content).hexdigest()
+
+    def tags(self, component):
+        entries = ["resources/js/app.tsx", f"resources/js/pages/{component}.tsx"]
+        styles, preloads, scripts = [], [], []
+        for entry in entries:
+            chunk = self.manifest.get(entry)
+            if chunk is None:
+                continue
+            for name in chunk.get("imports", []):
+                preloads.append(f"/build/{self.manifest[name]['file']}")
+            styles.extend(f"/build/{css}" for css in chunk.get("css", []))
+            scripts.append(f"/build/{chunk['file']}")
+        return "\n".join(
+            [f'<link rel="stylesheet" href="{href}">' for href in dict.fromkeys(styles)]
+            + [f'<link rel="modulepreload" href="{href}">' for href in dict.fromkeys(preloads) if href not in scripts]
+            + [f'<script type="module" src="{src}"></script>' for src in scripts]
+        )
+
+
+class Response:
+    def __init__(self, status, body=b"", content_type="text/html; charset=UTF-8", headers=None):
+        self.status = status
+        self.body = body.encode() if isinstance(body, str) else body
+        self.headers = dict(headers or {}, **{"Content-Type": content_type})
+        self.cookies = []
+
+    @classmethod
+    def json(cls, data, status=200, headers=None):
+        return cls(status, json.dumps(data), "application/json", headers)
+
+    @classmethod
+    def redirect(cls, location, status=302):
+        return cls(status, f'<meta http-equiv="refresh" content="0;url={html.escape(location)}">', headers={"Location": location})
+
+
+class BadRequest(Exception):
+    """A request body the stand-in cannot read, answered with `response`"""
+
+    def __init__(self, response):
+        super().__init__(response.status)
+        self.response = response
+
+
+class Request:
+    def __init__(self, method, target, headers, body):
+        parts = urlsplit(target)
+        self.method = method
+        self.target = target
+        self.path = parts.path
+        self.query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        self.headers = headers
+        cookie = SimpleCookie()
+        cookie.load(headers.get("Cookie", ""))
+        self.cookies = {key: morsel.value for key, morsel in cookie.items()}
+        self.data = {}
+        content_type = headers.get("Content-Type", "")
+        if body and "json" in content_type:
+            try:
+                self.data = json.loads(body)
+            except ValueError:  # Also covers bodies that are not UTF-8
+                raise BadRequest(Response.json({"message": "The request body is not valid JSON."}, 400))
+            if not isinstance(self.data, dict):
+                raise BadRequest(Response.json({"message": "The request body must be a JSON object."}, 422))
+        elif body:
+            self.data = {key: values[-1] for key, values in parse_qs(body.decode(errors="replace")).items()}
+        self.data = normalize(self.data)
+
+    @property
+    def inertia(self):
+        return self.headers.get("X-Inertia") is not None
+
+
+class StandIn:
+    """Application state and routes"""
+
+    def __init__(self, public=PUBLIC):
+        self.public = public
+        self.assets = Assets(public)
+        self.lock = threading.Lock()
+        self.donations = []
+        self.sessions = {}
+        self.admin = {
+            "id": 1,
+            "name": "Admin",
+            "email": ADMIN_EMAIL,
+            "is_admin": 1,
+            "email_verified_at": None,
+            "created_at": now(),
+            "updated_at": now(),
+        }
+
+    def handle(self, request):
+        if request.path.startswith("/api/"):
+            return self.api(request)
+        if request.method in ("GET", "HEAD") and self.static_file(request.path):
+            return self.static(request.path)
+        if request.path == "/up":
+            return Response(200, "<!DOCTYPE html><title>OK</title>Application up")
+        return self.web(request)
+
+    # Web routes ---------------------------------------------------------
+
+    def web(self, request):
+        session_id, session = self.session(request)
+        # Flashed data is visible to exactly one following request
+        session["flashed"] = session.pop("flash", {})
+
+        if request.method == "POST" and not self.valid_token(request, session):
+            response = Response(419, "<!DOCTYPE html><title>Page Expired</title>419 | Page Expired")
+        elif (request.inertia and request.method == "GET"
+              and request.headers.get("X-Inertia-Version", "") != (self.assets.version or "")):
+            response = Response(409, headers={"X-Inertia-Location": f"http://{request.headers.get('Host')}{request.target}"})
+            session["flash"] = session["flashed"]
+        else:
+            response, session_id, session = self.route(request, session_id, session)
+
+        if request.method == "GET" and not request.inertia and response.status == 200:
+            session["previous"] = request.target
+        response.cookies.append(f"{SESSION_COOKIE}={session_id}; path=/; httponly; samesite=lax")
+        response.cookies.append(f"XSRF-TOKEN={session['token']}; path=/; samesite=lax")
+        return response
+
+    def route(self, request, session_id, session):
+        path, method = request.path, request.method
+        if path == "/" and method == "GET":
+            return self.render(request, session, "welcome"), session_id, session
+        if path == "/donate" and method == "GET":
+            return self.render(request, session, "donate"), session_id, session
+        if path == "/donate" and method == "POST":
+            errors = validate(request.data, DONATION_RULES)
+            if errors:
+                return self.back(request, session, errors), session_id, session
+            self.create(request.data)
+            return self.back(request, session), session_id, session
+        if path == "/admin/login" and method == "GET":
+            if session.get("user"):
+                return Response.redirect("/admin"), session_id, session
+            return self.render(request, session, "admin-login"), session_id, session
+        if path == "/admin/login" and method == "POST":
+            errors = validate(request.data, LOGIN_RULES)
+            if errors:
+                return self.back(request, session, errors), session_id, session
+            if request.data["email"] != ADMIN_EMAIL or request.data["password"] != ADMIN_PASSWORD:
+                return self.back(request, session, {"email": [BAD_CREDENTIALS]}), session_id, session
+            # $request->session()->regenerate(): new id, same token
+            with self.lock:
+                # A concurrent request with the same cookie may have ended this session already
+                self.sessions.pop(session_id, None)
+                session_id = secrets.token_hex(20)
+                self.sessions[session_id] = session
+            session["user"] = self.admin
+            return Response.redirect("/admin"), session_id, session
+        if path == "/admin/logout" and method == "POST":
+            with self.lock:
+                self.sessions.pop(session_id, None)
+            session_id, session = self.new_session()
+            return Response.redirect("/admin/login"), session_id, session
+        if path == "/admin" and method == "GET":
+            if not session.get("user"):
+                return Response.redirect("/admin/login"), session_id, session
+            return self.render(request, session, "admin"), session_id, session
+        if path in ("/", "/donate", "/admin/login", "/admin/logout", "/admin"):
+            return Response(405, "405 | Method Not Allowed"), session_id, session
+        return Response(404, "<!DOCTYPE html><title>Not Found</title>404 | Not Found"), session_id, session
+
+    def session(self, request):
+        session_id = request.cookies.get(SESSION_COOKIE)
+        with self.lock:
+            session = self.sessions.get(session_id)
+        if session is None:
+            return self.new_session()
+        return session_id, session
+
+    def new_session(self):
+        session_id = secrets.token_hex(20)
+        session = {"token": secrets.token_urlsafe(30), "user": None, "flash": {}}
+        with self.lock:
+            self.sessions[session_id] = session
+        return session_id, session
+
+    @staticmethod
+    def valid_token(request, session):
+        token = (
+            request.headers.get("X-CSRF-TOKEN")
+            or unquote(request.headers.get("X-XSRF-TOKEN", ""))
+            or request.data.get("_token")
+        )
+        return bool(token) and secrets.compare_digest(token, session["token"])
+
+    def back(self, request, session, errors=None):
+        if errors:
+            session["flash"] = {"errors": {field: messages[0] for field, messages in errors.items()}}
+        location = request.headers.get("Referer") or session.get("previous") or "/"
+        return Response.redirect(location)
+
+    def render(self, request, session, component):
+        message, author = random.choice(QUOTES)
+        page = {
+            "component": component,
+            "props": {
+                "errors": session["flashed"].get("errors", {}),
+                "name": APP_NAME,
+                "quote": {"message": message, "author": author},
+                "auth": {"user": session.get("user")},
+            },
+            "url": request.target,
+            "version": self.assets.version,
+            "clearHistory": False,
+            "encryptHistory": False,
+        }
+        if request.inertia:
+            return Response.json(page, headers={"X-Inertia": "true", "Vary": "X-Inertia"})
+        return Response(200, f"""<!DOCTYPE html>
+<html lang="en">
+    <head>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <title inertia>{APP_NAME}</title>
+        <link rel="icon" href="/favicon.ico" sizes="any">
+        <link rel="icon" href="/favicon.svg" type="image/svg+xml">
+        <link rel="apple-touch-icon" href="/apple-touch-icon.png">
+        <link rel="preconnect" href="https://fonts.bunny.net">
+        <link href="https://fonts.bunny.net/css?family=instrument-sans:400,500,600" rel="stylesheet" />
+        {self.assets.tags(component)}
+    </head>
+    <body class="font-sans antialiased">
+        <div id="app" data-page="{html.escape(json.dumps(page))}"></div>
+    </body>
+</html>
+""", headers={"Vary": "X-Inertia"})
+
+    # API routes ---------------------------------------------------------
+
+    def api(self, request):
+        path, method = request.path, request.method
+        if path == "/api/donations" and method == "GET":
+            with self.lock:
+                donations = sorted(self.donations, key=lambda d: (d["created_at"], d["id"]), reverse=True)
+            return Response.json({"success": True, "data": donations, "count": len(donations)})
+        if path == "/api/donations" and method == "POST":
+            errors = validate(request.data, DONATION_RULES)
+            if errors:
+                return Response.json({"success": False, "errors": errors}, 422)
+            return Response.json({
+                "success": True,
+                "message": "Donation created successfully",
+                "data": self.create(request.data),
+            }, 201)
+        if path == "/api/currency/rates" and method == "GET":
+            return Response.json({
+                code: {"code": code, "rate": rate, "symbol": SYMBOLS[code]} for code, rate in RATES.items()
+            })
+        return Response.json({"message": f"The route {path.lstrip('/')} could not be found."}, 404)
+
+    def create(self, data):
+        """Donation::create($request->all()), returning the model as created"""
+        created = {key: data[key] for key in DONATION_RULES if key in data}
+        created["amount"] = f"{float(created['amount']):.2f}"
+        with self.lock:
+            created.update(id=len(self.donations) + 1, created_at=now(), updated_at=now())
+            self.donations.append(dict({"currency": "USD", "message": None}, **created))
+        return created
+
+    # Static files -------------------------------------------------------
+
+    def static_file(self, path):
+        full = os.path.realpath(os.path.join(self.public, unquote(path).lstrip("/")))
+        if full.startswith(self.public + os.sep) and os.path.isfile(full) and not full.endswith(".php"):
+            return full
+        return None
+
+    def static(self, path):
+        full = self.static_file(path)
+        with open(full, "rb") as handle:
+            body = handle.read()
+        headers = {}
+        if path.startswith("/build/assets/"):
+            headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return Response(200, body, mimetypes.guess_type(full)[0] or "application/octet-stream", headers)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like nginx in front of the real app
+    disable_nagle_algorithm = True  # Headers and body go out in separate writes
+    app = None
+
+    def dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            request = Request(self.command, self.path, self.headers, body)
+        except BadRequest as error:
+            response = error.response
+        else:
+            response = self.app.handle(request)
+        self.send_response(response.status)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        for cookie in response.cookies:
+            self.send_header("Set-Cookie", cookie)
+        self.send_header("Content-Length", str(len(response.body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(response.body)
+
+    do_GET = do_POST = do_HEAD = do_PUT = do_PATCH = do_DELETE = dispatch
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start(host="127.0.0.1", port=0):
+    """Serve a fresh stand-in from a background thread and return (server, url)"""
+    handler = type("StandInHandler", (Handler,), {"app": StandIn()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="standin", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def stop(started):
+    """Shut down a stand-in returned by start()"""
+    server, _ = started
+    server.shutdown()
+    server.server_close()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("app")
+    group.addoption("--app", choices=["real", "standin", "isolated"], default=os.environ.get("SELENIUM_APP", "real"),
+                    help="run against the real application at --app-url, an in-process stand-in, or one "
+                         "application per worker with its own database (see support.database)")
+    group.addoption("--app-url", default=os.environ.get("SELENIUM_APP_URL", BASE_URL),
+                    help=f"URL of the real application (default {BASE_URL})")
+
+
+@pytest.fixture(scope="session")
+def upstream_url(request):
+    """Base URL of the real application or the stand-in (tests use app_url, see support.http_archive)"""
+    if request.config.getoption("app") == "real":
+        yield request.config.getoption("app_url").rstrip("/")
+        return
+    if request.config.getoption("app") == "isolated":
+        yield request.getfixturevalue("isolated_app").url
+        return
+    if watch.active:
+        yield watch.keep("standin", start, stop)[1]
+        return
+    started = start()
+    yield started[1]
+    stop(started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the stand-in application")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    server, url = start(args.host, args.port)
+    print(f"stand-in serving {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
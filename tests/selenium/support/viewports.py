@@ -0,0 +1,126 @@
+"""Responsive checks across many breakpoints at once.
+
+Instead of resizing the real window and waiting after each resize, every
+breakpoint gets its own tab in the pooled browser with the device metrics
+emulated through the DevTools protocol. All tabs start loading together and
+are then read one after the other, so a ten-breakpoint matrix costs roughly
+one page load. Each tab reports its layout facts in a single scripted call:
+
+    layouts = viewports.render(driver, f"{base_url}/")
+    layouts["iphone-se"]["overflowing"]     # elements sticking out of the viewport
+    layouts["iphone-se"]["links"]["/donate"]  # is the link visible without scrolling sideways?
+"""
+from collections import namedtuple
+
+from support import network
+
+Breakpoint = namedtuple("Breakpoint", "width height mobile scale")
+
+BREAKPOINTS = {
+    "iphone-se": Breakpoint(375, 667, True, 2),
+    "iphone-14": Breakpoint(390, 844, True, 3),
+    "pixel-7": Breakpoint(412, 915, True, 2.625),
+    "small-phone": Breakpoint(320, 568, True, 2),
+    "ipad-mini": Breakpoint(768, 1024, True, 2),
+    "ipad-air": Breakpoint(820, 1180, True, 2),
+    "ipad-pro": Breakpoint(1024, 1366, True, 2),
+    "laptop": Breakpoint(1366, 768, False, 1),
+    "desktop": Breakpoint(1920, 1080, False, 1),
+    "wide": Breakpoint(2560, 1440, False, 1),
+}
+
+LAYOUT = """
+const done = arguments[arguments.length - 1];
+const deadline = performance.now() + arguments[0] * 1000;
+
+const clipped = (element) => {
+    for (let parent = element.parentElement; parent; parent = parent.parentElement) {
+        if (getComputedStyle(parent).overflowX !== 'visible') return true;
+    }
+    return false;
+};
+const shown = (element) => {
+    const style = getComputedStyle(element);
+    const rect = element.getBoundingClientRect();
+    return style.visibility !== 'hidden' && style.display !== 'none' && rect.width > 0 && rect.height > 0;
+};
+const describe = (element) => element.tagName.toLowerCase()
+    + (element.id ? '#' + element.id : '')
+    + (typeof element.className === 'string' && element.className ? '.' + element.className.trim().split(/\\s+/).slice(0, 3).join('.') : '');
+
+const collect = () => {
+    const width = document.documentElement.clientWidth;
+    const overflowing = [...document.body.querySelectorAll('*')]
+        .filter((element) => shown(element) && !clipped(element))
+        .filter((element) => {
+            const rect = element.getBoundingClientRect();
+            return rect.right > width + 1 || rect.left < -1;
+        })
+        .slice(0, 20)
+        .map(describe);
+    const links = {};
+    for (const link of document.querySelectorAll('a[href]')) {
+        const rect = link.getBoundingClientRect();
+        const href = link.getAttribute('href');
+        links[href] = links[href] || (shown(link) && rect.left >= 0 && rect.right <= width + 1);
+    }
+    return {
+        width: window.innerWidth,
+        height: window.innerHeight,
+        scroll_width: document.documentElement.scrollWidth,
+        horizontal_scroll: document.documentElement.scrollWidth > width,
+        overflowing,
+        links,
+    };
+};
+
+const poll = () => {
+    const app = document.getElementById('app');
+    if (document.readyState === 'complete' && app && app.childElementCount > 0) {
+        setTimeout(() => done(collect()), 50);
+    } else if (performance.now() > deadline) {
+        done(null);
+    } else {
+        setTimeout(poll, 25);
+    }
+};
+poll();
+"""
+
+
+def emulate(driver, breakpoint):
+    """Emulate a breakpoint's device metrics in the current tab"""
+    driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", {
+        "width": breakpoint.width,
+        "height": breakpoint.height,
+        "deviceScaleFactor": breakpoint.scale,
+        "mobile": breakpoint.mobile,
+    })
+    driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": breakpoint.mobile})
+
+
+def render(driver, url, breakpoints=None, timeout=10):
+    """Load `url` at every breakpoint in parallel tabs and return their layouts"""
+    breakpoints = breakpoints or BREAKPOINTS
+    home = driver.current_window_handle
+    tabs = {}
+    try:
+        for name, breakpoint in breakpoints.items():
+            driver.switch_to.new_window("tab")
+            tabs[name] = driver.current_window_handle
+            if getattr(driver, "network_policy", False):
+                network.block(driver)  # Blocking is per tab
+            emulate(driver, breakpoint)
+            # Page.navigate returns once the load has started, unlike driver.get
+            driver.execute_cdp_cmd("Page.navigate", {"url": url})
+
+        layouts = {}
+        for name, handle in tabs.items():
+            driver.switch_to.window(handle)
+            layouts[name] = driver.execute_async_script(LAYOUT, timeout)
+        return layouts
+    finally:
+        for handle in tabs.values():
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(home)
@@ -0,0 +1,73 @@
+"""Which application paths each test visits.
+
+Pooled browsers report every page they are sent to and the page they were
+left on, and the API client reports every request path. After a run the
+paths of each test are merged into results/visits.json. support.watch reads
+that file to decide which tests a changed page, route or controller affects.
+"""
+import json
+import os
+from urllib.parse import urlparse
+
+from support import reporting
+
+SUITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_paths = set()
+_ran = False
+
+
+def visit(url):
+    """Note that the running test requested this URL or path"""
+    if url and not url.startswith(("about:", "data:")):
+        _paths.add(urlparse(url).path or "/")
+
+
+def pytest_addoption(parser):
+    parser.getgroup("watch").addoption(
+        "--visits-output", default="results/visits.json", help="where to keep the paths each test visited",
+    )
+
+
+def resolve(config):
+    return os.path.join(SUITE_ROOT, config.getoption("visits_output"))
+
+
+def load(path):
+    """Visited paths per test id from an earlier run, {} when there is none"""
+    try:
+        with open(path) as handle:
+            return {test: set(paths) for test, paths in json.load(handle).items()}
+    except FileNotFoundError:
+        return {}
+
+
+def pytest_runtest_logstart(nodeid, location):
+    # support.history logs a retried test once, so its paths cover every attempt
+    global _ran
+    _paths.clear()
+    _ran = False
+
+
+def pytest_runtest_logreport(report):
+    global _ran
+    if report.when == "call":
+        _ran = True
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    # Tests skipped or broken in setup stay unknown, so support.watch runs them
+    if _ran:
+        reporting.record("visits", test=nodeid, paths=sorted(_paths))
+
+
+def pytest_sessionfinish(session):
+    entries = reporting.entries("visits")
+    if reporting.is_worker(session.config) or not entries:
+        return
+    path = resolve(session.config)
+    visits = load(path)
+    visits.update({entry["test"]: set(entry["paths"]) for entry in entries})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as handle:
+        json.dump({test: sorted(paths) for test, paths in sorted(visits.items())}, handle, indent=2)
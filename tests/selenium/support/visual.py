@@ -0,0 +1,188 @@
+"""Visual regression snapshots.
+
+`snapshot(driver, "donate")` screenshots the viewport and compares it with the
+baseline stored in `visual/donate.png`. Before the screenshot, animations,
+transitions and the text caret are switched off. Elements matching the `mask`
+selectors (numbers that change from run to run) are hidden without moving
+anything else.
+
+Baselines are optimised PNGs. `visual/index.json` holds, per baseline, a
+digest of its pixels and a 64-bit difference hash (dHash). When the new
+screenshot has the same pixel digest, the check ends without decoding the
+baseline. Otherwise both images are compared as NumPy arrays. A pixel counts
+as changed when any channel differs by more than `--visual-tolerance`. The
+snapshot fails when more than `--visual-max-changed` of all pixels changed.
+Only then is a diff image written to results/visual/: the baseline, the
+screenshot and the changed pixels in red, side by side.
+
+    pytest --update-snapshots          # accept the current screenshots as baselines
+
+A test whose baseline has not been recorded and committed yet is reported as
+xfail, and listed as "no baseline" in the summary, so the missing coverage
+stays visible.
+"""
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from support import reporting
+
+SUITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINES = os.path.join(SUITE_ROOT, "visual")
+DIFFS = os.path.join(SUITE_ROOT, "results", "visual")
+
+FREEZE = """
+const style = document.createElement('style');
+style.textContent = `
+    *, *::before, *::after { animation: none !important; transition: none !important; caret-color: transparent !important; }
+    ${arguments[0].map((selector) => selector + ' { visibility: hidden !important; }').join('\\n')}
+`;
+document.head.appendChild(style);
+document.activeElement && document.activeElement.blur();
+"""
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("visual")
+    group.addoption("--update-snapshots", action="store_true", help="store the current screenshots as baselines")
+    group.addoption("--visual-tolerance", type=int, default=16,
+                    help="per-channel difference a pixel may have and still count as unchanged (default 16)")
+    group.addoption("--visual-max-changed", type=float, default=0.001,
+                    help="fraction of changed pixels a snapshot may have (default 0.001)")
+
+
+def pixels(png):
+    """Decode a PNG into an RGB array"""
+    return np.asarray(Image.open(io.BytesIO(png)).convert("RGB"))
+
+
+def digest(image):
+    return hashlib.sha256(np.ascontiguousarray(image).tobytes()).hexdigest()
+
+
+def dhash(image):
+    """64-bit difference hash of an RGB array"""
+    gray = Image.fromarray(image).convert("L").resize((9, 8), Image.LANCZOS)
+    rows = np.asarray(gray, dtype=np.int16)
+    bits = (rows[:, 1:] > rows[:, :-1]).flatten()
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def changed(baseline, current, tolerance):
+    """Boolean mask of the pixels that differ by more than `tolerance`"""
+    if baseline.shape != current.shape:
+        return None
+    # Find the rows that differ at all, comparing eight bytes at a time, and
+    # only diff those; a layout break rarely touches the whole frame
+    height = baseline.shape[0]
+    before, after = baseline.reshape(height, -1), current.reshape(height, -1)
+    if before.shape[1] % 8 == 0:
+        before, after = before.view(np.uint64), after.view(np.uint64)
+    rows = np.flatnonzero((before != after).any(axis=1))
+
+    mask = np.zeros(baseline.shape[:2], dtype=bool)
+    if rows.size:
+        old, new = baseline[rows], current[rows]
+        mask[rows] = ((np.maximum(old, new) - np.minimum(old, new)) > tolerance).any(axis=2)
+    return mask
+
+
+def diff_image(baseline, current, mask):
+    """Baseline, screenshot and the changed pixels, side by side"""
+    height = max(baseline.shape[0], current.shape[0])
+    panels = []
+    for image in (baseline, current):
+        panel = np.zeros((height, image.shape[1], 3), dtype=np.uint8)
+        panel[:image.shape[0]] = image
+        panels.append(panel)
+    if mask is not None:
+        highlight = (current // 3).astype(np.uint8)
+        highlight[mask] = (255, 0, 0)
+        panels.append(highlight)
+    return Image.fromarray(np.concatenate(panels, axis=1))
+
+
+class Snapshots:
+    """Baseline store for one run"""
+
+    def __init__(self, config):
+        self.update = config.getoption("update_snapshots")
+        self.tolerance = config.getoption("visual_tolerance")
+        self.max_changed = config.getoption("visual_max_changed")
+        self.index_path = os.path.join(BASELINES, "index.json")
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as handle:
+                self.index = json.load(handle)
+
+    def save(self, name, image):
+        os.makedirs(BASELINES, exist_ok=True)
+        Image.fromarray(image).save(os.path.join(BASELINES, f"{name}.png"), optimize=True)
+        if os.path.exists(self.index_path):
+            # Other workers may have stored baselines since this one started
+            with open(self.index_path) as handle:
+                self.index.update(json.load(handle))
+        self.index[name] = {
+            "digest": digest(image),
+            "dhash": f"{dhash(image):016x}",
+            "size": [image.shape[1], image.shape[0]],
+        }
+        with open(self.index_path, "w") as handle:
+            json.dump(self.index, handle, indent=2, sort_keys=True)
+
+    def check(self, driver, name, mask=()):
+        driver.execute_script(FREEZE, list(mask))
+        current = pixels(driver.get_screenshot_as_png())
+
+        if self.update:
+            self.save(name, current)
+            reporting.record("visual", name=name, result="updated", changed=0.0)
+            return
+        stored = self.index.get(name)
+        if stored is None:
+            reporting.record("visual", name=name, result="no baseline", changed=0.0)
+            pytest.xfail(f"no baseline committed for snapshot {name!r}; record visual/{name}.png against the "
+                         "seeded app with --update-snapshots and commit visual/")
+        if digest(current) == stored["digest"]:
+            reporting.record("visual", name=name, result="identical", changed=0.0)
+            return
+
+        baseline = np.asarray(Image.open(os.path.join(BASELINES, f"{name}.png")).convert("RGB"))
+        difference = changed(baseline, current, self.tolerance)
+        ratio = 1.0 if difference is None else float(difference.mean())
+        if ratio <= self.max_changed:
+            reporting.record("visual", name=name, result="within tolerance", changed=ratio)
+            return
+
+        os.makedirs(DIFFS, exist_ok=True)
+        diff_path = os.path.join(DIFFS, f"{name}-diff.png")
+        diff_image(baseline, current, difference).save(diff_path)
+        distance = bin(dhash(current) ^ int(stored["dhash"], 16)).count("1")
+        reporting.record("visual", name=name, result="changed", changed=ratio)
+        pytest.fail(
+            f"snapshot {name!r}: {ratio:.2%} of pixels changed "
+            f"(size {current.shape[1]}x{current.shape[0]} vs {baseline.shape[1]}x{baseline.shape[0]}, "
+            f"dHash distance {distance}/64), diff written to {diff_path}"
+        )
+
+
+@pytest.fixture(scope="session")
+def snapshots(request):
+    return Snapshots(request.config)
+
+
+@pytest.fixture
+def snapshot(snapshots):
+    """Compare the current viewport with a stored baseline: snapshot(driver, name, mask=())"""
+    return snapshots.check
+
+
+@reporting.summary("visual", "visual snapshots")
+def render(terminalreporter, entries):
+    for entry in sorted(entries, key=lambda e: e["name"]):
+        terminalreporter.write_line(f"{entry['result']:<17} {entry['changed']:7.3%}  {entry['name']}")
@@ -0,0 +1,146 @@
+"""Readiness waits that return as soon as the application has settled.
+
+A small script is installed into every page before the application loads.
+It counts Inertia visits (through the `inertia:start` and `inertia:finish`
+document events) and in-flight fetch/XHR requests. The waits below poll that
+state instead of sleeping for a fixed time, and every wait is recorded so the
+summary shows how long the suite really spent waiting and on which pages.
+"""
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from support import reporting
+
+INSTRUMENTATION = """
+(() => {
+    if (window.__suite) return;
+    const state = window.__suite = { visits: 0, finished: 0, inflight: 0, lastActivity: performance.now() };
+    const touch = () => { state.lastActivity = performance.now(); };
+
+    document.addEventListener('inertia:start', () => { state.visits++; touch(); });
+    document.addEventListener('inertia:finish', () => { state.finished++; touch(); });
+
+    const fetch = window.fetch;
+    window.fetch = function (...args) {
+        state.inflight++;
+        touch();
+        return fetch.apply(this, args).finally(() => { state.inflight--; touch(); });
+    };
+
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        state.inflight++;
+        touch();
+        this.addEventListener('loadend', () => { state.inflight--; touch(); });
+        return send.apply(this, args);
+    };
+})();
+"""
+
+STATE = """
+const state = window.__suite;
+const app = document.getElementById('app');
+return {
+    ready: document.readyState === 'complete' && !!app && app.childElementCount > 0,
+    finished: state ? state.finished : 0,
+    inflight: state ? state.inflight : 0,
+    quiet: state ? performance.now() - state.lastActivity : 0,
+};
+"""
+
+
+def install(driver):
+    """Install the readiness instrumentation into every future page"""
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": INSTRUMENTATION})
+
+
+class Waiter:
+    """Waits for page loads, Inertia visits and network idle"""
+
+    def __init__(self, driver, timeout=10, idle=0.15, poll=0.05):
+        self.driver = driver
+        self.timeout = timeout
+        self.idle = idle
+        self.poll = poll
+
+    def state(self):
+        """Read the instrumentation state from the current page"""
+        return self.driver.execute_script(STATE)
+
+    def until(self, condition, label, replaces=None):
+        """Wait for `condition(driver)` to hold and record how long it took"""
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return WebDriverWait(self.driver, self.timeout, poll_frequency=self.poll).until(condition)
+        except TimeoutException:
+            timed_out = True
+            raise
+        finally:
+            reporting.record(
+                "waits",
+                label=label,
+                page=urlparse(self.driver.current_url).path or "/",
+                seconds=time.perf_counter() - started,
+                replaces=replaces,
+                timed_out=timed_out,
+            )
+
+    def settled(self, state):
+        """True when no request is in flight and the idle window has passed"""
+        return state["inflight"] == 0 and state["quiet"] >= self.idle * 1000
+
+    def for_page(self, label, replaces=None):
+        """Wait until the page is loaded, the Inertia app is mounted and the network is idle"""
+        def loaded(driver):
+            state = self.state()
+            return state["ready"] and self.settled(state)
+        return self.until(loaded, label, replaces)
+
+    def for_idle(self, label, replaces=None):
+        """Wait until no fetch/XHR request has been active for the idle window"""
+        return self.until(lambda driver: self.settled(self.state()), label, replaces)
+
+    def for_text(self, text, label, replaces=None):
+        """Wait until the page body contains the given text (case-insensitive)"""
+        script = "return document.body ? document.body.innerText.toLowerCase() : ''"
+        return self.until(lambda d: text.lower() in d.execute_script(script), label, replaces)
+
+    @contextmanager
+    def visit(self, label, replaces=None):
+        """Wait for the Inertia visit triggered inside the block to finish and settle"""
+        before = self.state()["finished"]
+
+        yield
+
+        def finished(driver):
+            state = self.state()
+            return state["finished"] > before and self.settled(state)
+        self.until(finished, label, replaces)
+
+
+@reporting.summary("waits", "readiness waits")
+def render(terminalreporter, entries):
+    waited = sum(e["seconds"] for e in entries)
+    replaced = sum(e["replaces"] or 0 for e in entries)
+    saved = sum((e["replaces"] or 0) - e["seconds"] for e in entries if e["replaces"])
+    terminalreporter.write_line(
+        f"{len(entries)} waits took {waited:.2f}s; the fixed sleeps they replace "
+        f"would have taken {replaced:.2f}s ({saved:.2f}s saved)"
+    )
+
+    pages = {}
+    for entry in entries:
+        pages.setdefault(entry["page"], []).append(entry["seconds"])
+    for page, seconds in sorted(pages.items(), key=lambda item: -sum(item[1])):
+        terminalreporter.write_line(
+            f"{page:<20} {len(seconds):>4} waits  total {sum(seconds):6.2f}s  slowest {max(seconds):6.2f}s"
+        )
+
+    for entry in entries:
+        if entry["timed_out"]:
+            terminalreporter.write_line(f"timed out: {entry['label']} on {entry['page']}")
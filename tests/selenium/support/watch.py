@@ -0,0 +1,258 @@
+"""Watch mode: rerun only the tests a change affects, in one warm process.
+
+    python -m support.watch
+    python -m support.watch --app standin -m "not visual"
+
+Every run goes through pytest.main in this process, so Python, the plugins
+and the resolved ChromeDriver are loaded once, and the browser pool and the
+stand-in server are kept from one run to the next (`keep`). Arguments other
+than the watcher's own are passed to every run; leave out `-n`, workers
+would start their own browsers each time.
+
+Watched, relative to the repository root:
+
+* resources/js/pages/*.tsx: the routes that render that Inertia page
+* routes/*.php: every route declared in the file
+* app/Http/Controllers/*.php: the routes handled by that controller
+* tests/selenium/test_*.py: the changed test file itself
+
+A test is rerun when it visited an affected route in an earlier run (see
+support.visits). Tests with no recorded visits always run. A change to
+conftest.py or support/ restarts the watcher. The first run covers every
+test when no visits have been recorded yet.
+"""
+import argparse
+import fnmatch
+import glob
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+
+import pytest
+
+from support import visits
+
+SUITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_ROOT = os.path.dirname(os.path.dirname(SUITE_ROOT))
+
+WATCHED = [
+    "resources/js/pages/*.tsx",
+    "routes/*.php",
+    "app/Http/Controllers/*.php",
+    "tests/selenium/test_*.py",
+]
+RESTART = ["tests/selenium/conftest.py", "tests/selenium/support/*.py"]
+
+ROUTE = re.compile(r"Route::(?:get|post|put|patch|delete|any)\(\s*'([^']*)'")
+HANDLER = re.compile(r"\[\s*(\w+)::class\s*,\s*'(\w+)'\s*\]")
+RENDER = re.compile(r"Inertia::render\(\s*'([^']+)'")
+METHOD = re.compile(r"function\s+(\w+)\s*\(")
+PARAMETER = re.compile(r"\\\{[^}]*\\\}")
+PREFIXES = {"api.php": "/api"}  # Added by Laravel's RouteServiceProvider
+
+Route = namedtuple("Route", "file path controller pages")
+
+active = False
+_kept = {}
+
+
+def keep(key, create, close):
+    """Create a resource on first use and keep it until the watcher exits.
+
+    Fixtures call this instead of creating and closing their resource when
+    `active` is set, so the next run reuses it.
+    """
+    if key not in _kept:
+        _kept[key] = (create(), close)
+    return _kept[key][0]
+
+
+def release():
+    """Close every kept resource"""
+    while _kept:
+        _, (resource, close) = _kept.popitem()
+        try:
+            close(resource)
+        except Exception:
+            pass
+
+
+def controller_pages(controller, method):
+    """Inertia pages rendered by one controller method"""
+    try:
+        with open(os.path.join(APP_ROOT, "app", "Http", "Controllers", f"{controller}.php")) as handle:
+            source = handle.read()
+    except FileNotFoundError:
+        return set()
+    methods = list(METHOD.finditer(source))
+    for index, match in enumerate(methods):
+        if match.group(1) == method:
+            end = methods[index + 1].start() if index + 1 < len(methods) else len(source)
+            return set(RENDER.findall(source, match.end(), end))
+    return set()
+
+
+def routes():
+    """Every route in routes/*.php with the controller and pages behind it"""
+    found = []
+    for file in sorted(glob.glob(os.path.join(APP_ROOT, "routes", "*.php"))):
+        with open(file) as handle:
+            source = handle.read()
+        prefix = PREFIXES.get(os.path.basename(file), "")
+        matches = list(ROUTE.finditer(source))
+        for index, match in enumerate(matches):
+            # A route's handler runs until the next route is declared
+            end = matches[index + 1].start() if index + 1 < len(matches) else len(source)
+            body = source[match.start():end]
+            pages = set(RENDER.findall(body))
+            handler = HANDLER.search(body)
+            if handler:
+                pages |= controller_pages(*handler.groups())
+            path = (prefix + "/" + match.group(1).strip("/")).rstrip("/") or "/"
+            found.append(Route(file, path, handler.group(1) if handler else None, pages))
+    return found
+
+
+def affected_routes(changed, known):
+    """Paths of the routes served by any of the changed files"""
+    pages_dir = os.path.join(APP_ROOT, "resources", "js", "pages")
+    controllers_dir = os.path.join(APP_ROOT, "app", "Http", "Controllers")
+    paths = set()
+    for file in changed:
+        name = os.path.splitext(os.path.basename(file))[0]
+        for route in known:
+            if (os.path.dirname(file) == pages_dir and name in route.pages
+                    or route.file == file
+                    or os.path.dirname(file) == controllers_dir and route.controller == name):
+                paths.add(route.path)
+    return paths
+
+
+def pattern(path):
+    """Regular expression matching a route path, `{id}` matching any segment"""
+    return re.compile(PARAMETER.sub("[^/]+", re.escape(path)))
+
+
+def snapshot():
+    """Modification time of every watched file"""
+    times = {}
+    for watched in WATCHED + RESTART:
+        for file in glob.glob(os.path.join(APP_ROOT, watched)):
+            try:
+                times[file] = os.stat(file).st_mtime_ns
+            except FileNotFoundError:
+                pass
+    return times
+
+
+def changes(before, after):
+    return {file for file in before.keys() | after.keys() if before.get(file) != after.get(file)}
+
+
+class Selection:
+    """Deselects every test the change cannot have affected"""
+
+    def __init__(self, tests, files, known):
+        self.tests = tests
+        self.files = files
+        self.known = known
+
+    def pytest_collection_modifyitems(self, config, items):
+        selected, deselected = [], []
+        for item in items:
+            wanted = item.nodeid in self.tests or str(item.path) in self.files or item.nodeid not in self.known
+            (selected if wanted else deselected).append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+
+class Watcher:
+    """Polls the watched files and reruns the affected tests"""
+
+    def __init__(self, args, visits_path, interval):
+        self.args = args
+        self.visits_path = visits_path
+        self.interval = interval
+        self.routes = routes()
+        self.times = snapshot()
+
+    def select(self, changed):
+        """Test ids, test files and route paths affected by the changed files"""
+        current = routes()
+        # Routes that were just removed still select the tests that used them
+        paths = affected_routes(changed, self.routes + current)
+        self.routes = current
+        patterns = [pattern(path) for path in paths]
+        recorded = visits.load(self.visits_path)
+        tests = {
+            test for test, visited in recorded.items()
+            if any(p.fullmatch(path) for path in visited for p in patterns)
+        }
+        files = {file for file in changed if os.path.basename(file).startswith("test_")}
+        return tests, files, set(recorded), paths
+
+    def run(self, plugins=()):
+        # Changed test modules must be imported again
+        for name, module in list(sys.modules.items()):
+            file = getattr(module, "__file__", None) or ""
+            if os.path.dirname(file) == SUITE_ROOT and os.path.basename(file).startswith("test_"):
+                del sys.modules[name]
+        return pytest.main(list(self.args), plugins=list(plugins))
+
+    def wait(self):
+        """Block until the watched files changed and stayed unchanged for one interval"""
+        changed = set()
+        while True:
+            time.sleep(self.interval)
+            current = snapshot()
+            latest = changes(self.times, current)
+            self.times = current
+            if latest:
+                changed |= latest
+            elif changed:
+                return changed
+
+    def loop(self):
+        if not os.path.exists(self.visits_path):
+            print("watch: no visits recorded yet, running every test")
+            self.run()
+        while True:
+            print(f"\nwatch: waiting for changes under {APP_ROOT} (Ctrl+C to stop)")
+            changed = self.wait()
+            names = sorted(os.path.relpath(file, APP_ROOT).replace(os.sep, "/") for file in changed)
+            if any(fnmatch.fnmatch(name, restart) for name in names for restart in RESTART):
+                print(f"watch: {', '.join(names)} changed, restarting")
+                release()
+                os.execv(sys.executable, [sys.executable, "-m", "support.watch", *sys.argv[1:]])
+            tests, files, known, paths = self.select(changed)
+            print(f"watch: {', '.join(names)} changed; routes {', '.join(sorted(paths)) or 'none'}; "
+                  f"{len(tests)} tests visited them")
+            self.run([Selection(tests, files, known)])
+
+
+def main(argv=None):
+    global active
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between polls of the watched files")
+    parser.add_argument("--visits-output", default="results/visits.json", help="passed on to pytest")
+    args, pytest_args = parser.parse_known_args(argv)
+    os.chdir(SUITE_ROOT)
+    active = True
+    try:
+        # support is imported before pytest starts, so its asserts are not rewritten here
+        quiet = ["-W", "ignore::pytest.PytestAssertRewriteWarning"]
+        Watcher([*quiet, *pytest_args, f"--visits-output={args.visits_output}"],
+                os.path.join(SUITE_ROOT, args.visits_output), args.interval).loop()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        release()
+
+
+if __name__ == "__main__":
+    # Fixtures check `active` on support.watch, not on this __main__ copy
+    from support.watch import main
+    main()
@@ -1,54 +1,29 @@
-import time
 import pytest
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+
+from support import inertia
 
 
 class TestAdminDashboard:
     """Test cases for Admin Dashboard functionality"""
 
     @pytest.fixture(autouse=True)
-    def login_as_admin(self, driver, base_url):
-        """Auto-login before each test"""
-        driver.get(f"{base_url}/admin/login")
-        
-        # Wait and login
-        email_input = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='text']"))
-        )
-        email_input.send_keys("admin@example.com")
-        
-        password_input = driver.find_element(By.CSS_SELECTOR, "input[type='password']")
-        password_input.send_keys("admin")
-        
-        submit_button = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-        submit_button.click()
-        
-        # Wait for redirect
-        WebDriverWait(driver, 10).until(
-            EC.url_contains("/admin")
-        )
-        
-        yield
+    def login_as_admin(self, driver, admin_session, wait):
+        """Open the dashboard with the cached admin session before each test"""
+        admin_session.open(driver)
         
-        # Logout after test (if logout button exists)
-        try:
-            logout_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Logout')]")
-            logout_button.click()
-            time.sleep(1)
-        except:
-            pass  # Logout button might not exist
+        # Wait for the dashboard to load its donations
+        wait.for_page("admin dashboard")
 
     def test_dashboard_loads_after_login(self, driver, base_url):
         """Test that dashboard loads successfully after login"""
         assert "/admin" in driver.current_url
-        assert "Admin Dashboard" in driver.page_source or "Dashboard" in driver.page_source
+        assert inertia.page(driver).component == "admin"
 
-    def test_dashboard_statistics_displayed(self, driver, base_url):
+    def test_dashboard_statistics_displayed(self, driver, base_url, wait):
         """Test that donation statistics are displayed"""
         # Wait for stats to load
-        time.sleep(2)
+        wait.for_idle("dashboard statistics", replaces=2)
         
         page_source = driver.page_source.lower()
         
@@ -57,9 +32,9 @@ class TestAdminDashboard:
         # Stats should show numbers
         assert any(char.isdigit() for char in page_source)
 
-    def test_donations_table_exists(self, driver, base_url):
+    def test_donations_table_exists(self, driver, base_url, wait):
         """Test that donations table is present"""
-        time.sleep(2)
+        wait.for_idle("donations table", replaces=2)
         
         page_source = driver.page_source.lower()
         
@@ -78,7 +53,7 @@ class TestAdminDashboard:
         # Check for navigation links
         assert "Admin Dashboard" in page_source or "Dashboard" in page_source
 
-    def test_dashboard_refresh_functionality(self, driver, base_url):
+    def test_dashboard_refresh_functionality(self, driver, base_url, wait):
         """Test that dashboard can be refreshed"""
         initial_url = driver.current_url
         
@@ -86,27 +61,26 @@ class TestAdminDashboard:
         driver.refresh()
         
         # Wait for page to reload
-        time.sleep(2)
+        wait.for_page("dashboard refresh", replaces=2)
         
         # Should still be on admin dashboard
         assert driver.current_url == initial_url
-        assert "Admin Dashboard" in driver.page_source or "Dashboard" in driver.page_source
+        assert inertia.page(driver).component == "admin"
 
-    def test_unauthorized_access_to_admin(self, driver, base_url):
+    def test_unauthorized_access_to_admin(self, driver, base_url, lookup, wait):
         """Test that unauthenticated users cannot access admin dashboard"""
         # Logout first (click logout button)
-        try:
-            logout_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Logout')]")
-            logout_button.click()
-            time.sleep(2)
-        except:
-            pass
+        logout_button = lookup.probe((By.XPATH, "//button[contains(text(), 'Logout')]"))
+        if logout_button is not None:
+            with wait.visit("admin logout", replaces=2):
+                logout_button.click()
         
         # Try to access admin directly
         driver.get(f"{base_url}/admin")
         
-        # Wait a moment
-        time.sleep(2)
+        # Wait for the redirect to settle
+        wait.for_page("admin guard redirect", replaces=2)
         
         # Should redirect to login
         assert "/admin/login" in driver.current_url or "login" in driver.current_url.lower()
+        assert inertia.page(driver).component == "admin-login"
@@ -1,34 +1,28 @@
-import time
 import pytest
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+
+from support import inertia
 
 
 class TestAdminLogin:
     """Test cases for Admin Login functionality"""
 
-    def test_admin_login_page_loads(self, driver, base_url):
+    def test_admin_login_page_loads(self, driver, base_url, lookup):
         """Test that the admin login page loads successfully"""
         driver.get(f"{base_url}/admin/login")
         
         # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "h1"))
-        )
+        lookup.expect((By.TAG_NAME, "h1"))
         
-        # Verify page title
-        assert "Admin Login" in driver.page_source
-        assert "Donation Management System" in driver.page_source
+        # Verify the login page component was rendered
+        assert inertia.page(driver).component == "admin-login"
         
-    def test_admin_login_form_exists(self, driver, base_url):
+    def test_admin_login_form_exists(self, driver, base_url, lookup):
         """Test that login form elements are present"""
         driver.get(f"{base_url}/admin/login")
         
         # Check for email input
-        email_input = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='text']"))
-        )
+        email_input = lookup.expect((By.CSS_SELECTOR, "input[type='text']"))
         assert email_input is not None
         
         # Check for password input
@@ -40,14 +34,12 @@ class TestAdminLogin:
         assert submit_button is not None
         assert "Login" in submit_button.text
 
-    def test_admin_login_with_valid_credentials(self, driver, base_url):
+    def test_admin_login_with_valid_credentials(self, driver, base_url, lookup, wait):
         """Test successful admin login"""
         driver.get(f"{base_url}/admin/login")
         
         # Wait for form to load
-        email_input = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='text']"))
-        )
+        email_input = lookup.expect((By.CSS_SELECTOR, "input[type='text']"))
         
         # Fill in the form
         email_input.clear()
@@ -59,25 +51,21 @@ class TestAdminLogin:
         
         # Submit the form
         submit_button = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-        submit_button.click()
         
-        # Wait for redirect to admin dashboard
-        WebDriverWait(driver, 10).until(
-            EC.url_contains("/admin")
-        )
+        # Wait for the login visit and its redirect to the admin dashboard
+        with wait.visit("admin login"):
+            submit_button.click()
         
         # Verify we're on the admin page
-        assert "/admin" in driver.current_url
-        assert "Admin Dashboard" in driver.page_source
+        assert driver.current_url.rstrip("/").endswith("/admin")
+        assert inertia.page(driver).component == "admin"
 
-    def test_admin_login_with_invalid_credentials(self, driver, base_url):
+    def test_admin_login_with_invalid_credentials(self, driver, base_url, lookup, wait):
         """Test login failure with invalid credentials"""
         driver.get(f"{base_url}/admin/login")
         
         # Wait for form to load
-        email_input = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='text']"))
-        )
+        email_input = lookup.expect((By.CSS_SELECTOR, "input[type='text']"))
         
         # Fill in with wrong credentials
         email_input.clear()
@@ -89,24 +77,24 @@ class TestAdminLogin:
         
         # Submit the form
         submit_button = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-        submit_button.click()
         
-        # Wait a moment for error message
-        time.sleep(2)
+        # Wait for the rejected login to come back with an error message
+        with wait.visit("admin login rejected", replaces=2):
+            submit_button.click()
         
         # Should stay on login page
         assert "/admin/login" in driver.current_url
-        # Error message should appear
-        assert "credentials" in driver.page_source.lower() or "error" in driver.page_source.lower()
+        # Error message should be returned for the email field
+        page = inertia.page(driver)
+        assert page.component == "admin-login"
+        assert "credentials" in page.errors["email"]
 
-    def test_demo_credentials_visible(self, driver, base_url):
+    def test_demo_credentials_visible(self, driver, base_url, lookup):
         """Test that demo credentials are displayed on the login page"""
         driver.get(f"{base_url}/admin/login")
         
         # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "h1"))
-        )
+        lookup.expect((By.TAG_NAME, "h1"))
         
         # Check for demo credentials display
         page_source = driver.page_source
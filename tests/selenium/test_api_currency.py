@@ -0,0 +1,33 @@
+import pytest
+
+pytestmark = pytest.mark.api
+
+SYMBOLS = {"USD": "$", "EUR": "€", "GBP": "£", "INR": "₹"}
+
+
+class TestCurrencyRatesApi:
+    """Test cases for GET /api/currency/rates"""
+
+    def test_rates_endpoint_returns_json(self, api):
+        """Test that the rates endpoint responds with JSON"""
+        response = api.get("/api/currency/rates")
+
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("application/json")
+
+    def test_all_supported_currencies_present(self, api):
+        """Test that every currency offered by the donation form has a rate"""
+        rates = api.get("/api/currency/rates").json()
+
+        for code in SYMBOLS:
+            assert code in rates
+
+    def test_rate_entries_are_well_formed(self, api):
+        """Test the code, rate and symbol of each entry"""
+        rates = api.get("/api/currency/rates").json()
+
+        for code, entry in rates.items():
+            assert entry["code"] == code
+            assert isinstance(entry["rate"], (int, float))
+            assert entry["rate"] > 0
+            assert entry["symbol"] == SYMBOLS.get(code, code)
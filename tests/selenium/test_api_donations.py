@@ -0,0 +1,127 @@
+import time
+
+import pytest
+
+pytestmark = pytest.mark.api
+
+
+def donation(**overrides):
+    """Valid donation payload, as submitted by the donation form tests"""
+    payload = {
+        "donor_name": "John Doe",
+        "donor_email": "john@example.com",
+        "amount": 100,
+        "currency": "USD",
+        "message": "Test donation via API",
+    }
+    payload.update(overrides)
+    return payload
+
+
+class TestCreateDonation:
+    """Test cases for POST /api/donations"""
+
+    def test_create_donation_returns_201(self, api):
+        """Test that a valid donation is created and echoed back"""
+        response = api.post("/api/donations", json=donation())
+
+        assert response.status_code == 201
+        body = response.json()
+        assert body["success"] is True
+        assert body["message"] == "Donation created successfully"
+        assert body["data"]["id"] > 0
+        assert body["data"]["donor_name"] == "John Doe"
+        assert body["data"]["donor_email"] == "john@example.com"
+        assert float(body["data"]["amount"]) == 100
+        assert body["data"]["currency"] == "USD"
+        assert body["data"]["message"] == "Test donation via API"
+
+    @pytest.mark.parametrize("currency", ["USD", "EUR", "GBP", "INR"])
+    def test_create_donation_with_each_currency(self, api, currency):
+        """Test donations in every currency offered by the form"""
+        response = api.post("/api/donations", json=donation(currency=currency, amount=50))
+
+        assert response.status_code == 201
+        assert response.json()["data"]["currency"] == currency
+
+    def test_optional_fields_can_be_omitted(self, api):
+        """Test that currency and message are optional"""
+        payload = donation()
+        del payload["currency"]
+        del payload["message"]
+
+        response = api.post("/api/donations", json=payload)
+
+        assert response.status_code == 201
+
+
+class TestDonationValidation:
+    """Test cases for the 422 validation errors of POST /api/donations"""
+
+    @pytest.mark.parametrize("field, value", [
+        ("donor_name", None),
+        ("donor_name", "x" * 256),
+        ("donor_email", None),
+        ("donor_email", "not-an-email"),
+        ("amount", None),
+        ("amount", 0),
+        ("amount", "abc"),
+        ("currency", "USDX"),
+        ("message", "x" * 1001),
+    ], ids=[
+        "name-missing", "name-too-long", "email-missing", "email-invalid", "amount-missing",
+        "amount-zero", "amount-not-numeric", "currency-too-long", "message-too-long",
+    ])
+    def test_invalid_field_is_rejected(self, api, field, value):
+        """Test that an invalid field returns the 422 error shape"""
+        payload = donation(**{field: value})
+        if value is None:
+            del payload[field]
+
+        response = api.post("/api/donations", json=payload)
+
+        assert response.status_code == 422
+        body = response.json()
+        assert body["success"] is False
+        assert list(body["errors"]) == [field]
+        assert isinstance(body["errors"][field], list)
+        assert body["errors"][field]
+
+    def test_empty_payload_reports_every_required_field(self, api):
+        """Test that all required fields are reported at once"""
+        response = api.post("/api/donations", json={})
+
+        assert response.status_code == 422
+        assert set(response.json()["errors"]) == {"donor_name", "donor_email", "amount"}
+
+
+class TestListDonations:
+    """Test cases for GET /api/donations"""
+
+    def test_list_includes_new_donation(self, api):
+        """Test that a created donation shows up in the listing"""
+        created = api.post("/api/donations", json=donation(donor_name="Listed Donor")).json()["data"]
+
+        response = api.get("/api/donations")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["success"] is True
+        assert body["count"] == len(body["data"])
+        assert created["id"] in [row["id"] for row in body["data"]]
+
+    def test_list_is_ordered_latest_first(self, api):
+        """Test that donations are ordered by created_at, newest first"""
+        older = api.post("/api/donations", json=donation(donor_name="Older Donor")).json()["data"]
+        # created_at has one-second resolution and comes from the server's clock, not ours;
+        # more than a second apart, the two donations always get different timestamps
+        time.sleep(1.1)
+        newer = api.post("/api/donations", json=donation(donor_name="Newer Donor")).json()["data"]
+
+        rows = api.get("/api/donations").json()["data"]
+        created = [row["created_at"] for row in rows]
+        ids = [row["id"] for row in rows]
+
+        assert newer["id"] > older["id"]
+        assert created == sorted(created, reverse=True)
+        assert ids.index(newer["id"]) < ids.index(older["id"])
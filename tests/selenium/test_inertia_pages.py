@@ -0,0 +1,45 @@
+import pytest
+
+from support import inertia
+
+pytestmark = pytest.mark.api
+
+
+class TestInertiaPages:
+    """Test cases for the Inertia page objects, requested without a browser"""
+
+    @pytest.mark.parametrize("path, component", [
+        ("/", "welcome"),
+        ("/donate", "donate"),
+        ("/admin/login", "admin-login"),
+    ])
+    def test_page_renders_component(self, api, path, component):
+        """Test that each route renders the expected page component"""
+        page = inertia.page(api, path)
+
+        assert page.component == component
+        assert page.errors == {}
+
+    def test_admin_requires_login(self, api):
+        """Test that the dashboard redirects guests to the login page"""
+        page = inertia.page(api, "/admin")
+
+        assert page.component == "admin-login"
+        assert page.url == "/admin/login"
+
+    def test_donation_validation_errors(self, api):
+        """Test that an invalid web donation comes back with field errors"""
+        page = inertia.request(api, "POST", "/donate", json={"donor_email": "not-an-email"})
+
+        assert page.component == "donate"
+        assert set(page.errors) == {"donor_name", "donor_email", "amount"}
+
+    def test_admin_login_rejects_bad_credentials(self, api):
+        """Test that a failed login reports the error on the email field"""
+        page = inertia.request(api, "POST", "/admin/login", json={
+            "email": "wrong@example.com",
+            "password": "wrongpassword",
+        })
+
+        assert page.component == "admin-login"
+        assert "credentials" in page.errors["email"]
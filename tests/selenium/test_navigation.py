@@ -1,32 +1,29 @@
-import time
 import pytest
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from support import forms, inertia, viewports
+
 
 class TestHomePage:
     """Test cases for Home/Welcome Page"""
 
-    def test_home_page_loads(self, driver, base_url):
+    def test_home_page_loads(self, driver, base_url, lookup):
         """Test that the home page loads successfully"""
         driver.get(base_url)
         
         # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        lookup.expect((By.TAG_NAME, "body"))
         
         assert driver.current_url == f"{base_url}/"
 
-    def test_navigation_to_donate_page(self, driver, base_url):
+    def test_navigation_to_donate_page(self, driver, base_url, lookup):
         """Test navigation from home to donate page"""
         driver.get(base_url)
         
         # Find and click donate link/button
-        donate_link = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.LINK_TEXT, "Make a Donation"))
-        )
+        donate_link = lookup.expect((By.LINK_TEXT, "Make a Donation"), EC.element_to_be_clickable)
         donate_link.click()
         
         # Wait for navigation
@@ -36,14 +33,12 @@ class TestHomePage:
         
         assert "/donate" in driver.current_url
 
-    def test_navigation_to_admin_login(self, driver, base_url):
+    def test_navigation_to_admin_login(self, driver, base_url, lookup):
         """Test navigation from home to admin login"""
         driver.get(base_url)
         
         # Find and click admin login link
-        admin_link = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.LINK_TEXT, "Admin Login"))
-        )
+        admin_link = lookup.expect((By.LINK_TEXT, "Admin Login"), EC.element_to_be_clickable)
         admin_link.click()
         
         # Wait for navigation
@@ -53,86 +48,65 @@ class TestHomePage:
         
         assert "/admin/login" in driver.current_url
 
-    def test_page_title_and_branding(self, driver, base_url):
+    def test_page_title_and_branding(self, driver, base_url, lookup):
         """Test that page has correct title and branding"""
         driver.get(base_url)
         
         # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "h1"))
-        )
+        lookup.expect((By.TAG_NAME, "h1"))
         
         # Check page title
         assert "Laravel" in driver.title or "Donation" in driver.title
 
     def test_responsive_design_elements(self, driver, base_url):
-        """Test that page renders correctly at different sizes"""
-        driver.get(base_url)
-        
-        # Desktop size
-        driver.set_window_size(1920, 1080)
-        time.sleep(1)
-        assert driver.find_element(By.TAG_NAME, "body") is not None
-        
-        # Tablet size
-        driver.set_window_size(768, 1024)
-        time.sleep(1)
-        assert driver.find_element(By.TAG_NAME, "body") is not None
-        
-        # Mobile size
-        driver.set_window_size(375, 667)
-        time.sleep(1)
-        assert driver.find_element(By.TAG_NAME, "body") is not None
+        """Test that the home page lays out at every breakpoint"""
+        layouts = viewports.render(driver, f"{base_url}/")
+
+        for name, layout in layouts.items():
+            assert layout is not None, f"{name}: page did not render"
+            assert not layout["horizontal_scroll"], f"{name}: page scrolls sideways ({layout['scroll_width']}px)"
+            assert not layout["overflowing"], f"{name}: elements overflow the viewport: {layout['overflowing']}"
+            assert layout["links"].get("/donate"), f"{name}: donate link not visible"
+            assert layout["links"].get("/admin/login"), f"{name}: admin login link not visible"
 
 
 class TestEndToEndWorkflow:
     """End-to-end test scenarios"""
 
-    def test_complete_donation_workflow(self, driver, base_url):
+    def test_complete_donation_workflow(self, driver, base_url, api, lookup, wait):
         """Test complete donation workflow from home to success"""
+        last_id = api.last_donation_id()
+        
         # Start at home page
         driver.get(base_url)
         
         # Navigate to donate page
-        donate_link = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.LINK_TEXT, "Make a Donation"))
-        )
+        donate_link = lookup.expect((By.LINK_TEXT, "Make a Donation"), EC.element_to_be_clickable)
         donate_link.click()
         
         # Wait for donate page
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.NAME, "donor_name"))
-        )
+        lookup.expect((By.NAME, "donor_name"))
         
         # Fill and submit donation
-        driver.find_element(By.NAME, "donor_name").send_keys("E2E Test User")
-        driver.find_element(By.NAME, "donor_email").send_keys("e2e@test.com")
-        driver.find_element(By.NAME, "amount").send_keys("250")
-        driver.find_element(By.NAME, "message").send_keys("End-to-end test donation")
+        forms.fill(driver, {
+            "donor_name": "E2E Test User",
+            "donor_email": "e2e@test.com",
+            "amount": "250",
+            "message": "End-to-end test donation",
+        })
         
         submit_button = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-        submit_button.click()
         
         # Wait for success
-        time.sleep(3)
-        assert "thank you" in driver.page_source.lower() or "success" in driver.page_source.lower()
+        with wait.visit("submit e2e donation", replaces=3):
+            submit_button.click()
+        assert inertia.page(driver).errors == {}
+        assert ("e2e@test.com", 250) in api.saved_donations(last_id)
 
-    def test_complete_admin_workflow(self, driver, base_url):
+    def test_complete_admin_workflow(self, driver, base_url, admin_session, lookup, wait):
         """Test complete admin workflow: login, view dashboard, logout"""
-        # Navigate to admin login
-        driver.get(f"{base_url}/admin/login")
-        
-        # Login
-        email_input = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='text']"))
-        )
-        email_input.send_keys("admin@example.com")
-        
-        password_input = driver.find_element(By.CSS_SELECTOR, "input[type='password']")
-        password_input.send_keys("admin")
-        
-        submit_button = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-        submit_button.click()
+        # Login with the cached admin session (the login form is covered by TestAdminLogin)
+        admin_session.open(driver)
         
         # Wait for dashboard
         WebDriverWait(driver, 10).until(
@@ -140,17 +114,14 @@ class TestEndToEndWorkflow:
         )
         
         # Verify dashboard loaded
-        assert "Admin Dashboard" in driver.page_source or "Dashboard" in driver.page_source
+        assert inertia.page(driver).component == "admin"
         
-        time.sleep(2)
+        wait.for_idle("e2e dashboard", replaces=2)
         
-        # Try to logout
-        try:
-            logout_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Logout')]")
-            logout_button.click()
-            time.sleep(2)
+        # Try to logout (the button might not be found, that's okay for this test)
+        logout_button = lookup.probe((By.XPATH, "//button[contains(text(), 'Logout')]"))
+        if logout_button is not None:
+            with wait.visit("e2e logout", replaces=2):
+                logout_button.click()
             # Should redirect to login
             assert "/login" in driver.current_url or driver.current_url == f"{base_url}/"
-        except:
-            # Logout button might not be found, that's okay for this test
-            pass
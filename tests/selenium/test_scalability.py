@@ -0,0 +1,54 @@
+import statistics
+import time
+
+import pytest
+
+from support import reporting
+from support.waits import Waiter
+
+pytestmark = pytest.mark.scalability
+
+ROWS_RENDERED = "return document.querySelectorAll('tbody tr').length"
+ROWS_RENDERED_AT = "return [document.querySelectorAll('tbody tr').length, performance.now()]"
+
+
+class TestDonationListingScalability:
+    """Test how the donation listing and dashboard scale with the dataset size"""
+
+    def test_api_listing(self, api, seeded_donations):
+        """Measure GET /api/donations response time and payload size"""
+        timings = []
+        for _ in range(3):
+            started = time.perf_counter()
+            response = api.get("/api/donations")
+            timings.append(time.perf_counter() - started)
+
+        assert response.status_code == 200
+        assert response.json()["count"] == seeded_donations
+
+        reporting.record("scalability", size=seeded_donations, metric="api_ms", value=statistics.median(timings) * 1000)
+        reporting.record("scalability", size=seeded_donations, metric="api_bytes", value=len(response.content))
+
+    def test_dashboard_becomes_interactive(self, driver, admin_session, seeded_donations):
+        """Measure the time from navigation until the dashboard lists every donation"""
+        wait = Waiter(driver, timeout=300)
+
+        reached = []
+
+        def rows_rendered(d):
+            # Timed in the same script as the count, before the idle window below;
+            # performance.now() counts from the start of the dashboard navigation
+            count, now = d.execute_script(ROWS_RENDERED_AT)
+            if count == seeded_donations:
+                reached.append(now)
+            return bool(reached)
+
+        admin_session.open(driver)
+        wait.until(rows_rendered, "dashboard rows")
+        wait.for_idle("dashboard idle")
+
+        elapsed = reached[0]
+        rows = driver.execute_script(ROWS_RENDERED)
+
+        reporting.record("scalability", size=seeded_donations, metric="dashboard_ms", value=elapsed)
+        reporting.record("scalability", size=seeded_donations, metric="dashboard_rows", value=rows)
@@ -0,0 +1,31 @@
+import pytest
+
+pytestmark = pytest.mark.visual
+
+# Numbers that depend on the donations in the database
+DASHBOARD_DATA = ["p.text-3xl", "p.mt-1", "tbody"]
+
+
+class TestVisualRegression:
+    """Screenshot comparisons against the baselines in visual/"""
+
+    def test_donate_page(self, driver, base_url, wait, snapshot):
+        """Test that the donation page looks like its baseline"""
+        driver.get(f"{base_url}/donate")
+        wait.for_page("donate snapshot")
+
+        snapshot(driver, "donate")
+
+    def test_admin_login_page(self, driver, base_url, wait, snapshot):
+        """Test that the admin login page looks like its baseline"""
+        driver.get(f"{base_url}/admin/login")
+        wait.for_page("admin login snapshot")
+
+        snapshot(driver, "admin-login")
+
+    def test_admin_dashboard(self, driver, admin_session, wait, snapshot):
+        """Test that the admin dashboard looks like its baseline"""
+        admin_session.open(driver)
+        wait.for_page("admin dashboard snapshot")
+
+        snapshot(driver, "admin-dashboard", mask=DASHBOARD_DATA)